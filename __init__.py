@@ -2,26 +2,80 @@
 
 from __future__ import annotations
 
+from functools import partial
+
 from homeassistant.const import CONF_HOST, CONF_PORT, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .coordinator import ZoneTouch3ConfigEntry, ZoneTouch3Coordinator
+from .capture import CaptureWriter
+from .const import CONF_CAPTURE, DATA_SCHEDULER, DOMAIN
+from .coordinator import ZoneTouch3ConfigEntry, ZoneTouch3Coordinator, state_store
+from .scheduler import PollScheduler
+from .services import async_setup_services
 from .zonetouch3 import ZoneTouch3Client
 
 PLATFORMS = [Platform.FAN, Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the ZoneTouch 3 services and the poll scheduler."""
+    hass.data[DATA_SCHEDULER] = PollScheduler()
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ZoneTouch3ConfigEntry) -> bool:
     """Set up ZoneTouch 3 from a config entry."""
-    client = ZoneTouch3Client(entry.data[CONF_HOST], entry.data[CONF_PORT])
+    capture: CaptureWriter | None = None
+    if entry.options.get(CONF_CAPTURE):
+        path = hass.config.path(DOMAIN, f"{entry.unique_id or entry.entry_id}.zt3cap")
+        capture = await hass.async_add_executor_job(CaptureWriter, path)
+        entry.async_on_unload(partial(_async_close_capture, hass, capture))
+    client = ZoneTouch3Client(
+        entry.data[CONF_HOST],
+        entry.data[CONF_PORT],
+        capture=capture.write if capture is not None else None,
+    )
+    await client.async_start()
+    entry.async_on_unload(client.async_stop)
     coordinator = ZoneTouch3Coordinator(hass, entry, client)
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_load_stored_state():
+        # Entities start from the last known state; the live state follows.
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), "zonetouch3_first_refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+    coordinator.start_polling(hass.data[DATA_SCHEDULER])
 
     entry.runtime_data = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
 
+async def _async_close_capture(hass: HomeAssistant, capture: CaptureWriter) -> None:
+    """Flush and close a capture file."""
+    await hass.async_add_executor_job(capture.close)
+
+
+async def _async_update_listener(
+    hass: HomeAssistant, entry: ZoneTouch3ConfigEntry
+) -> None:
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ZoneTouch3ConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ZoneTouch3ConfigEntry) -> None:
+    """Delete the stored state of a removed config entry."""
+    await state_store(hass, entry.unique_id or entry.entry_id).async_remove()
@@ -0,0 +1,324 @@
+"""Benchmarks for the ZoneTouch 3 protocol codec and client round trips.
+
+Codec benchmarks run the hot paths of zonetouch3.py over a fixed corpus of
+frames: a 16-zone group status message, group names and system information
+with maximum-length fields, and variants dense with 0x55 bytes so that byte
+stuffing is exercised as much as possible. Client benchmarks measure
+ZoneTouch3Client against the in-process emulator over loopback.
+
+Each result reports operations per second and the mean, median and 95th
+percentile time per call (codec benchmarks time batches of 100 calls, so
+their percentiles are of batch means). Allocations are traced with
+tracemalloc: alloc_blocks_per_call and alloc_bytes_per_call are the memory
+blocks and bytes each call leaves allocated, with its result kept alive,
+averaged over many calls; alloc_peak_bytes is the most memory one call has
+allocated at any moment, temporaries included. Client figures include the
+emulator's, as it runs in the same process. Results are written as JSON so
+runs can be compared:
+
+    python benchmarks/bench.py --output before.json
+    python benchmarks/bench.py --compare before.json
+
+--compare exits with status 1 if any benchmark got slower by more than the
+--threshold fraction (default 0.2).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from emulator import NAME_LENGTH, ZoneTouch3Emulator  # noqa: E402
+import zonetouch3 as zt  # noqa: E402
+
+_MIN_TIME = 0.2  # seconds per codec benchmark
+_ROUND_TRIPS = 200
+_TRACED_CALLS = 100
+# Memory held by tracemalloc's own snapshots is not the benchmark's.
+_NOT_TRACEMALLOC = tracemalloc.Filter(False, tracemalloc.__file__)
+
+
+def _emulator(dense: bool) -> ZoneTouch3Emulator:
+    """A 16-zone console, optionally with every text field made of 0x55."""
+    emulator = ZoneTouch3Emulator(16)
+    if dense:
+        for zone in emulator.zones.values():
+            zone.name = "U" * NAME_LENGTH
+            zone.percentage = 0x55
+        emulator.system = zt.SystemInfo(
+            system_id="U" * 16,
+            name="U" * 16,
+            installer="U" * 16,
+            installer_phone="U" * 12,
+            firmware_version="U" * 12,
+            console_version="U" * 7,
+            temperature=emulator.system.temperature,
+        )
+    return emulator
+
+
+def _corpus() -> dict[str, bytes]:
+    """Frames as sent by the console, keyed by a short description."""
+    corpus = {}
+    for suffix, dense in (("", False), ("_dense", True)):
+        emulator = _emulator(dense)
+        corpus[f"status_16{suffix}"] = emulator.group_status_frame()
+        corpus[f"names_16{suffix}"] = emulator.group_names_frame()
+        corpus[f"system_info{suffix}"] = emulator.system_info_frame()
+    return corpus
+
+
+def _measure(func: Callable[[], object]) -> dict[str, float]:
+    """Time func until _MIN_TIME has passed and trace its allocations."""
+    samples: list[float] = []
+    deadline = time.perf_counter() + _MIN_TIME
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for _ in range(100):
+            func()
+        samples.append((time.perf_counter() - start) / 100)
+
+    func()  # warm up caches created on first use
+    with _traced() as held:
+        for index in range(_TRACED_CALLS):
+            held[index] = func()
+    with _traced(peak=True) as peak:
+        func()
+    return _timings(samples) | held.result | peak.result
+
+
+def _timings(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    mean = statistics.fmean(samples)
+    return {
+        "ops_per_sec": 1 / mean,
+        "mean_us": mean * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p95_us": samples[int(len(samples) * 0.95)] * 1e6,
+    }
+
+
+class _Held(list[object]):
+    """Results kept alive while tracing, and the allocation figures."""
+
+    def __init__(self) -> None:
+        super().__init__([None] * _TRACED_CALLS)  # no growth while tracing
+        self.result: dict[str, float] = {}
+
+
+@contextmanager
+def _traced(*, peak: bool = False) -> Iterator[_Held]:
+    """Trace the allocations of _TRACED_CALLS calls, or the peak of one.
+
+    The block stores each call's result in the list it is given.
+    """
+    held = _Held()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        yield held
+        highest = tracemalloc.get_traced_memory()[1] - baseline
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    if peak:
+        held.result["alloc_peak_bytes"] = highest
+        return
+    stats = after.filter_traces((_NOT_TRACEMALLOC,)).compare_to(
+        before.filter_traces((_NOT_TRACEMALLOC,)), "filename"
+    )
+    held.result["alloc_blocks_per_call"] = (
+        sum(stat.count_diff for stat in stats) / _TRACED_CALLS
+    )
+    held.result["alloc_bytes_per_call"] = (
+        sum(stat.size_diff for stat in stats) / _TRACED_CALLS
+    )
+
+
+def codec_benchmarks() -> dict[str, dict[str, float]]:
+    """Benchmark framing, CRC and parsing over the corpus."""
+    results = {}
+    for name, frame in _corpus().items():
+        frame_data = zt.FrameDecoder().feed(frame)[0]
+        body = frame[len(zt.HEADER) : -2]  # as transmitted, before the CRC
+        payload = (  # the same before stuffing
+            frame_data.address
+            + bytes((zt.MESSAGE_ID, frame_data.msg_type))
+            + len(frame_data.data).to_bytes(2, "big")
+            + frame_data.data
+        )
+        results[f"crc16/{name}"] = _measure(lambda: zt._crc16(body))
+        results[f"stuff/{name}"] = _measure(lambda: zt._stuff(payload))
+        results[f"build_message/{name}"] = _measure(
+            lambda: zt.build_message(
+                frame_data.address, frame_data.msg_type, frame_data.data
+            )
+        )
+        results[f"decode/{name}"] = _measure(lambda: zt.FrameDecoder().feed(frame))
+        results[f"decode_bytewise/{name}"] = _measure(
+            lambda: _feed_bytewise(frame)
+        )
+        parser: Callable[[bytes], object] = (
+            zt._parse_group_status
+            if name.startswith("status")
+            else zt._parse_group_names
+            if name.startswith("names")
+            else zt._parse_system_info
+        )
+        results[f"parse/{name}"] = _measure(
+            lambda: _parse_uncached(parser, frame_data.data)
+        )
+        if parser is zt._parse_group_status:  # an unchanged message, as polled
+            results[f"parse_cached/{name}"] = _measure(
+                lambda: parser(frame_data.data)
+            )
+    command = ((3, (zt.PowerCommand.ON, 50)),)
+    results["control_frame/built"] = _measure(
+        lambda: zt._control_frame.__wrapped__(command)
+    )
+    results["control_frame/cached"] = _measure(lambda: zt._control_frame(command))
+    return results
+
+
+def _parse_uncached(parser: Callable[[bytes], object], data: bytes) -> object:
+    """Parse data with no zone status cached, as a changed message is."""
+    zt._zone_status.cache_clear()
+    return parser(data)
+
+
+def _feed_bytewise(frame: bytes) -> None:
+    """Decode a frame delivered one byte at a time (worst case chunking)."""
+    decoder = zt.FrameDecoder()
+    for index in range(len(frame)):
+        decoder.feed(frame[index : index + 1])
+
+
+async def _round_trips(
+    operation: Callable[[], Awaitable[object]]
+) -> dict[str, float]:
+    await operation()  # connect and warm up
+    samples = []
+    for _ in range(_ROUND_TRIPS):
+        start = time.perf_counter()
+        await operation()
+        samples.append(time.perf_counter() - start)
+    with _traced() as held:
+        for index in range(_TRACED_CALLS):
+            held[index] = await operation()
+    with _traced(peak=True) as peak:
+        await operation()
+    return _timings(samples) | held.result | peak.result
+
+
+async def client_benchmarks() -> dict[str, dict[str, float]]:
+    """Benchmark ZoneTouch3Client against the emulator over loopback."""
+    results = {}
+    emulator = _emulator(dense=False)
+    await emulator.async_start()
+    try:
+        for mode in ("short_lived", "persistent"):
+            client = zt.ZoneTouch3Client("127.0.0.1", emulator.port)
+            if mode == "persistent":
+                await client.async_start()
+            try:
+                results[f"client_{mode}/get_state"] = await _round_trips(
+                    client.async_get_state
+                )
+                results[f"client_{mode}/get_zones"] = await _round_trips(
+                    client.async_get_zones
+                )
+                results[f"client_{mode}/set_zone"] = await _round_trips(
+                    lambda: client.async_set_zone(0, zt.PowerCommand.ON, 50)
+                )
+                results[f"client_{mode}/set_zones_16"] = await _round_trips(
+                    lambda: client.async_set_zones(
+                        {zone: (zt.PowerCommand.ON, 50) for zone in range(16)}
+                    )
+                )
+            finally:
+                await client.async_stop()
+    finally:
+        await emulator.async_stop()
+    return results
+
+
+def _compare(
+    results: dict[str, dict[str, float]], baseline_path: Path, threshold: float
+) -> list[str]:
+    """Return a description of every benchmark slower than the baseline."""
+    baseline = json.loads(baseline_path.read_text())["results"]
+    regressions = []
+    for name, result in results.items():
+        if (before := baseline.get(name)) is None:
+            continue
+        ratio = result["ops_per_sec"] / before["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append(
+                f"{name}: {before['ops_per_sec']:.0f} -> "
+                f"{result['ops_per_sec']:.0f} ops/s ({ratio - 1:+.0%})"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks and print or store the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="write results to this file")
+    parser.add_argument("--compare", type=Path, help="baseline results file")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument(
+        "--only", choices=("codec", "client"), help="run one group only"
+    )
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    if args.only != "client":
+        results |= codec_benchmarks()
+    if args.only != "codec":
+        results |= asyncio.run(client_benchmarks())
+
+    report: dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    for name, result in sorted(results.items()):
+        print(
+            f"{name:45} {result['ops_per_sec']:>12,.0f} ops/s "
+            f"{result['mean_us']:>10.1f} us",
+            file=sys.stderr,
+        )
+    if args.compare:
+        regressions = _compare(results, args.compare, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
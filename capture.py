@@ -0,0 +1,265 @@
+"""Capture of raw ZoneTouch 3 traffic, and offline replay of captures.
+
+A capture file starts with MAGIC and is followed by records, each a
+little-endian header (data length: uint32, Unix time: float64, direction:
+uint8, see zonetouch3.Direction) and the raw bytes exactly as they were sent
+or received, including byte stuffing and any garbage. Records are only ever
+appended; a record cut short by a crash is ignored when reading, and cut off
+before a CaptureWriter appends to the file again.
+
+Captures come from ZoneTouch3Client(..., capture=CaptureWriter(path).write),
+or from the integration's capture option. Inspect or replay them with:
+
+    python capture.py dump capture.zt3cap
+    python capture.py replay capture.zt3cap --repeat 100
+
+Replay feeds the received bytes through FrameDecoder and the message parsers
+as fast as possible and reports throughput and errors, which makes captures
+from real installations both a regression corpus and a benchmark.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from typing import BinaryIO
+
+try:
+    from . import zonetouch3 as zt
+except ImportError:  # run as a script, outside Home Assistant
+    import zonetouch3 as zt  # type: ignore[no-redef]
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"ZT3CAP1\n"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_RECORD = struct.Struct("<IdB")  # data length, time, direction
+_DIRECTIONS = frozenset(zt.Direction)
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureRecord:
+    """One chunk of captured traffic."""
+
+    timestamp: float
+    direction: zt.Direction
+    data: bytes
+
+
+class CaptureWriter:
+    """Appends captured traffic to a file.
+
+    write only queues the record; a background thread writes it, buffered,
+    so write is safe to call from the event loop. Opening and closing touch
+    the file system, and close waits for queued records to be written, so
+    under Home Assistant they belong in the executor. Capturing stops, with a
+    warning, once the file reaches max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._max_bytes = max_bytes
+        file: BinaryIO = open(path, "a+b", buffering=64 * 1024)
+        try:
+            if file.seek(0, os.SEEK_END) == 0:
+                file.write(MAGIC)
+            else:  # drop a record cut short, so appended ones can be read
+                file.truncate(_complete_size(file, path))
+        except BaseException:
+            file.close()
+            raise
+        self._size = file.seek(0, os.SEEK_END)
+        self._open = True
+        # Records to write, then None to close the file.
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._write_queued,
+            args=(file,),
+            name=f"capture {path}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def write(self, direction: zt.Direction, data: bytes) -> None:
+        """Append one chunk; matches the zonetouch3.Capture signature."""
+        if not self._open:
+            return
+        if self._size + _RECORD.size + len(data) > self._max_bytes:
+            _LOGGER.warning("Capture %s is full; no longer capturing", self.path)
+            self._stop()
+            return
+        self._queue.put(_RECORD.pack(len(data), time.time(), direction) + data)
+        self._size += _RECORD.size + len(data)
+
+    def close(self) -> None:
+        """Write the queued records, then close the file."""
+        self._stop()
+        self._thread.join()
+
+    def _stop(self) -> None:
+        if self._open:
+            self._open = False
+            self._queue.put(None)
+
+    def _write_queued(self, file: BinaryIO) -> None:
+        """Write records from the queue until told to close; in the thread."""
+        try:
+            with file:
+                while (record := self._queue.get()) is not None:
+                    file.write(record)
+        except OSError:
+            _LOGGER.exception("Cannot write capture %s; no longer capturing", self.path)
+            self._open = False
+
+
+def _complete_size(file: BinaryIO, path: str) -> int:
+    """Length of a capture file up to the end of its last complete record."""
+    size = file.seek(0, os.SEEK_END)
+    file.seek(0)
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{path} is not a ZoneTouch 3 capture")
+    offset = len(MAGIC)
+    while offset + _RECORD.size <= size:
+        file.seek(offset)
+        length, _, direction = _RECORD.unpack(file.read(_RECORD.size))
+        end = offset + _RECORD.size + length
+        if end > size or direction not in _DIRECTIONS:
+            break
+        offset = end
+    return offset
+
+
+def read_capture(path: str) -> Iterator[CaptureRecord]:
+    """Yield the records of a capture file, reading it through mmap."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < len(MAGIC):
+            raise ValueError(f"{path} is not a ZoneTouch 3 capture")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            if view[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a ZoneTouch 3 capture")
+            offset = len(MAGIC)
+            while offset + _RECORD.size <= len(view):
+                length, timestamp, direction = _RECORD.unpack_from(view, offset)
+                start = offset + _RECORD.size
+                if start + length > len(view) or direction not in _DIRECTIONS:
+                    break  # the last record was cut short
+                yield CaptureRecord(
+                    timestamp, zt.Direction(direction), view[start : start + length]
+                )
+                offset = start + length
+
+
+def _message_kind(msg_type: int, data: bytes) -> str:
+    if zt._is_group_status(msg_type, data):
+        return "group_status"
+    if zt._is_group_names(msg_type, data):
+        return "group_names"
+    if zt._is_system_info(msg_type, data):
+        return "system_info"
+    return f"type_0x{msg_type:02x}"
+
+
+_PARSERS = {
+    "group_status": zt._parse_group_status,
+    "group_names": zt._parse_group_names,
+    "system_info": zt._parse_system_info,
+}
+
+
+def replay(records: list[CaptureRecord]) -> Counter[str]:
+    """Decode and parse the received traffic of a capture once.
+
+    Returns counts of the messages seen by kind, plus resyncs (corrupt data
+    dropped by the decoder) and parse_errors.
+    """
+    counts: Counter[str] = Counter()
+    decoder = zt.FrameDecoder()
+    for record in records:
+        if record.direction is not zt.Direction.RECEIVED:
+            continue
+        for _, msg_type, data in decoder.feed(record.data):
+            kind = _message_kind(msg_type, data)
+            counts[kind] += 1
+            if (parse := _PARSERS.get(kind)) is not None:
+                try:
+                    parse(data)
+                except zt.ZoneTouch3ProtocolError:
+                    counts["parse_errors"] += 1
+    if decoder.resyncs:
+        counts["resyncs"] = decoder.resyncs
+    return counts
+
+
+def _dump(path: str) -> None:
+    decoders = {direction: zt.FrameDecoder() for direction in zt.Direction}
+    for record in read_capture(path):
+        stamp = datetime.fromtimestamp(record.timestamp).isoformat(
+            timespec="milliseconds"
+        )
+        print(f"{stamp} {record.direction.name:<8} {record.data.hex()}")
+        decoder = decoders[record.direction]
+        resyncs = decoder.resyncs
+        frames = decoder.feed(record.data)
+        if decoder.resyncs != resyncs:
+            print("    corrupt data skipped")
+        for _, msg_type, data in frames:
+            print(f"    {_message_kind(msg_type, data)}: {data.hex()}")
+
+
+def _replay(path: str, repeat: int) -> None:
+    records = list(read_capture(path))
+    received = sum(
+        len(record.data)
+        for record in records
+        if record.direction is zt.Direction.RECEIVED
+    )
+    start = time.perf_counter()
+    for _ in range(repeat):
+        counts = replay(records)
+    elapsed = time.perf_counter() - start
+    frames = sum(
+        count
+        for kind, count in counts.items()
+        if kind not in ("resyncs", "parse_errors")
+    )
+    print(f"{len(records)} records, {received} bytes received")
+    for kind, count in sorted(counts.items()):
+        print(f"  {kind}: {count}")
+    print(
+        f"{repeat} replays in {elapsed:.3f} s: "
+        f"{frames * repeat / elapsed:,.0f} frames/s, "
+        f"{received * repeat / elapsed / 1e6:.1f} MB/s"
+    )
+
+
+def main() -> None:
+    """Dump or replay a capture file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    dump = commands.add_parser("dump", help="print records and decoded frames")
+    dump.add_argument("path")
+    replay_parser = commands.add_parser(
+        "replay", help="decode and parse at full speed"
+    )
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    if args.command == "dump":
+        _dump(args.path)
+    else:
+        _replay(args.path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Command line client for one or many ZoneTouch 3 consoles.
+
+Uses only zonetouch3.py and the standard library, so it runs without Home
+Assistant and starts quickly. Consoles are given as HOST or HOST:PORT, or
+read from a file with @FILE (one per line). At most --concurrency consoles
+are talked to at once. Output is NDJSON on stdout, one object per console
+per result, each with "host", "port" and "time" and either "state" (or
+"zones" for set) or "error":
+
+    python cli.py query 192.168.1.20 192.168.1.21
+    python cli.py set 192.168.1.20 --zone 0 --zone 3 --percentage 50
+    python cli.py watch @consoles.txt --interval 60
+
+query prints the full state (system information and zones) once. set
+controls the given zones (group numbers from 0, as the console reports
+them) with one message per console and prints the zones it reports. watch
+prints the state every --interval seconds until interrupted or --count polls
+have been made. If there are no more consoles than --concurrency it keeps a
+connection to each open and also prints every change a console pushes;
+otherwise it connects for each poll, --concurrency consoles at a time. The
+exit status is 1 if any console failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import AsyncExitStack
+import json
+import sys
+import time
+from typing import Any
+
+try:
+    from . import zonetouch3 as zt
+except ImportError:  # run as a script, outside Home Assistant
+    import zonetouch3 as zt  # type: ignore[no-redef]
+
+DEFAULT_CONCURRENCY = 16
+
+POWER_COMMANDS = {
+    "on": zt.PowerCommand.ON,
+    "off": zt.PowerCommand.OFF,
+    "turbo": zt.PowerCommand.TURBO,
+}
+
+Target = tuple[str, int]
+
+
+def _target(text: str) -> Target:
+    host, sep, port = text.rpartition(":")
+    if not sep:
+        return text, zt.DEFAULT_PORT
+    try:
+        return host, int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid port in {text!r}") from None
+
+
+def _emit(target: Target, **fields: Any) -> None:
+    host, port = target
+    record = {"host": host, "port": port, "time": round(time.time(), 3), **fields}
+    sys.stdout.write(json.dumps(record, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def _zone_command(power: str | None, percentage: int | None) -> zt.ZoneCommand:
+    """Same rules as the set_zones service: 0% closes, a percentage opens."""
+    if percentage == 0:
+        return zt.PowerCommand.OFF, None
+    if power is None:
+        return zt.PowerCommand.ON, percentage
+    return POWER_COMMANDS[power], percentage
+
+
+async def _query(
+    target: Target, args: argparse.Namespace, slots: asyncio.Semaphore
+) -> bool:
+    client = zt.ZoneTouch3Client(*target, timeout=args.timeout)
+    try:
+        async with slots:
+            state = await client.async_get_state()
+    except zt.ZoneTouch3Error as err:
+        _emit(target, error=str(err))
+        return False
+    _emit(target, state=state.as_dict())
+    return True
+
+
+async def _set(
+    target: Target, args: argparse.Namespace, slots: asyncio.Semaphore
+) -> bool:
+    client = zt.ZoneTouch3Client(*target, timeout=args.timeout)
+    command = _zone_command(args.power, args.percentage)
+    try:
+        async with slots:
+            zones = await client.async_set_zones(
+                {zone: command for zone in args.zone}
+            )
+    except zt.ZoneTouch3Error as err:
+        _emit(target, error=str(err))
+        return False
+    # The reply is a group status message, which has no names.
+    _emit(target, zones=zt.ZoneTouchState(zones=zones).as_dict()["zones"])
+    return True
+
+
+async def _watch(
+    target: Target, args: argparse.Namespace, slots: asyncio.Semaphore
+) -> bool:
+    client = zt.ZoneTouch3Client(*target, timeout=args.timeout)
+    state: zt.ZoneTouchState | None = None
+
+    def pushed(zones: dict[int, zt.ZoneStatus]) -> None:
+        nonlocal state
+        if state is not None:
+            state = state.with_status(zones, merge=True)
+            _emit(target, event="push", state=state.as_dict())
+
+    async def poll() -> zt.ZoneTouchState:
+        if state is None:
+            return await client.async_get_state()
+        return state.with_status(await client.async_get_zones())
+
+    # A persistent connection holds its slot for as long as it is open, so
+    # it is only used when every console can have one.
+    persistent = len(args.consoles) <= args.concurrency
+    ok = True
+    async with AsyncExitStack() as stack:
+        if persistent:
+            await stack.enter_async_context(slots)
+            client.add_status_listener(pushed)
+            await client.async_start()
+            stack.push_async_callback(client.async_stop)
+        polls = 0
+        while args.count is None or polls < args.count:
+            if polls:
+                await asyncio.sleep(args.interval)
+            polls += 1
+            try:
+                if persistent:
+                    state = await poll()
+                else:
+                    async with slots:
+                        state = await poll()
+            except zt.ZoneTouch3Error as err:
+                ok = False
+                _emit(target, event="poll", error=str(err))
+            else:
+                _emit(target, event="poll", state=state.as_dict())
+    return ok
+
+
+_COMMANDS = {"query": _query, "set": _set, "watch": _watch}
+
+
+async def _run(args: argparse.Namespace) -> bool:
+    slots = asyncio.Semaphore(args.concurrency)
+    command = _COMMANDS[args.command]
+    args.consoles = list(dict.fromkeys(args.consoles))
+    results = await asyncio.gather(
+        *(command(target, args, slots) for target in args.consoles)
+    )
+    return all(results)
+
+
+def main() -> int:
+    """Run a command against the consoles given on the command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0], fromfile_prefix_chars="@"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="consoles talked to at once",
+    )
+    parser.add_argument("--timeout", type=float, default=zt.DEFAULT_TIMEOUT)
+    commands = parser.add_subparsers(dest="command", required=True)
+    query = commands.add_parser("query", help="print the state once")
+    query.add_argument("consoles", nargs="+", type=_target)
+    set_parser = commands.add_parser("set", help="control zones")
+    set_parser.add_argument("consoles", nargs="+", type=_target)
+    set_parser.add_argument("--zone", type=int, action="append", required=True)
+    set_parser.add_argument("--power", choices=POWER_COMMANDS)
+    set_parser.add_argument("--percentage", type=int)
+    watch = commands.add_parser("watch", help="print the state as it changes")
+    watch.add_argument("consoles", nargs="+", type=_target)
+    watch.add_argument("--interval", type=float, default=60.0, help="seconds")
+    watch.add_argument("--count", type=int, help="stop after this many polls")
+    args = parser.parse_args()
+    if args.command == "set":
+        if args.power is None and args.percentage is None:
+            parser.error("set needs --power and/or --percentage")
+        if not all(0 <= zone <= 15 for zone in args.zone):
+            parser.error("zones are numbered 0-15")
+        if args.percentage is not None and not 0 <= args.percentage <= 100:
+            parser.error("the percentage must be 0-100")
+    try:
+        return 0 if asyncio.run(_run(args)) else 1
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,11 +7,34 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import callback
 
-from .const import DOMAIN, MODEL
+from .const import (
+    CONF_CAPTURE,
+    CONF_COMMAND_INTERVAL,
+    CONF_INFO_INTERVAL,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_TEMPERATURE_WINDOW,
+    DEFAULT_INFO_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_TEMPERATURE_WINDOW,
+    DOMAIN,
+    MODEL,
+)
+from .coordinator import async_discover_consoles, state_store
+from .discovery import DiscoveredConsole
 from .zonetouch3 import (
+    DEFAULT_COMMAND_INTERVAL,
     DEFAULT_PORT,
     ZoneTouch3Client,
     ZoneTouch3ConnectionError,
@@ -20,7 +43,10 @@ from .zonetouch3 import (
 
 _LOGGER = logging.getLogger(__name__)
 
-STEP_USER_SCHEMA = vol.Schema(
+CONF_CONSOLE = "console"
+MANUAL_ENTRY = "manual"
+
+STEP_MANUAL_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
         vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
@@ -33,8 +59,52 @@ class ZoneTouch3ConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Start with nothing discovered."""
+        self._discovered: dict[str, DiscoveredConsole] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> ZoneTouch3OptionsFlow:
+        """Get the options flow for this handler."""
+        return ZoneTouch3OptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Offer the consoles found on the network, or manual entry."""
+        if user_input is not None:
+            if user_input[CONF_CONSOLE] == MANUAL_ENTRY:
+                return await self.async_step_manual()
+            console = self._discovered[user_input[CONF_CONSOLE]]
+            if console.system.system_id:
+                await self.async_set_unique_id(console.system.system_id)
+                self._abort_if_unique_id_configured()
+            return self.async_create_entry(
+                title=console.system.name or MODEL,
+                data={CONF_HOST: console.host, CONF_PORT: console.port},
+            )
+
+        configured = self._async_current_ids()
+        self._discovered = {
+            console.system.system_id or console.host: console
+            for console in await async_discover_consoles(self.hass)
+            if console.system.system_id not in configured
+        }
+        if not self._discovered:
+            return await self.async_step_manual()
+        consoles = {
+            key: f"{console.system.name or MODEL} ({console.host})"
+            for key, console in self._discovered.items()
+        }
+        consoles[MANUAL_ENTRY] = "Enter an address"
+        return self.async_show_form(
+            step_id="user",
+            data_schema=vol.Schema({vol.Required(CONF_CONSOLE): vol.In(consoles)}),
+        )
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Ask for the console address and verify we can talk to it."""
         errors: dict[str, str] = {}
@@ -65,10 +135,75 @@ class ZoneTouch3ConfigFlow(ConfigFlow, domain=DOMAIN):
                 if state.system.system_id:
                     await self.async_set_unique_id(state.system.system_id)
                     self._abort_if_unique_id_configured()
+                    # Setup starts from this state instead of fetching it again.
+                    await state_store(self.hass, state.system.system_id).async_save(
+                        state.as_dict()
+                    )
                 return self.async_create_entry(
                     title=state.system.name or MODEL, data=user_input
                 )
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_SCHEMA, errors=errors
+            step_id="manual", data_schema=STEP_MANUAL_SCHEMA, errors=errors
+        )
+
+
+class ZoneTouch3OptionsFlow(OptionsFlow):
+    """Handle ZoneTouch 3 options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage how often the console is queried and controlled."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if (
+                user_input[CONF_MIN_POLL_INTERVAL]
+                > user_input[CONF_MAX_POLL_INTERVAL]
+            ):
+                errors["base"] = "poll_interval_range"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = user_input or self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_INFO_INTERVAL,
+                    default=options.get(CONF_INFO_INTERVAL, DEFAULT_INFO_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Required(
+                    CONF_COMMAND_INTERVAL,
+                    default=options.get(
+                        CONF_COMMAND_INTERVAL, DEFAULT_COMMAND_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+                vol.Required(
+                    CONF_MIN_POLL_INTERVAL,
+                    default=options.get(
+                        CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                vol.Required(
+                    CONF_MAX_POLL_INTERVAL,
+                    default=options.get(
+                        CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                vol.Required(
+                    CONF_CAPTURE, default=options.get(CONF_CAPTURE, False)
+                ): bool,
+                vol.Required(
+                    CONF_TEMPERATURE_WINDOW,
+                    default=options.get(
+                        CONF_TEMPERATURE_WINDOW, DEFAULT_TEMPERATURE_WINDOW
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=168)),
+                vol.Required(
+                    CONF_OPTIMISTIC, default=options.get(CONF_OPTIMISTIC, False)
+                ): bool,
+            }
+        )
+        return self.async_show_form(
+            step_id="init", data_schema=schema, errors=errors
         )
@@ -1,5 +1,37 @@
 """Constants for the Polyaire ZoneTouch 3 integration."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.util.hass_dict import HassKey
+
+if TYPE_CHECKING:
+    from .scheduler import PollScheduler
+
 DOMAIN = "zonetouch3"
 MANUFACTURER = "Polyaire"
 MODEL = "ZoneTouch 3"
+
+CONF_INFO_INTERVAL = "info_interval"
+DEFAULT_INFO_INTERVAL = 300  # seconds
+CONF_COMMAND_INTERVAL = "command_interval"
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+DEFAULT_MIN_POLL_INTERVAL = 3  # seconds
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+DEFAULT_MAX_POLL_INTERVAL = 300  # seconds
+CONF_CAPTURE = "capture"  # record raw traffic to <config>/zonetouch3/
+CONF_OPTIMISTIC = "optimistic"
+CONF_TEMPERATURE_WINDOW = "temperature_window"
+DEFAULT_TEMPERATURE_WINDOW = 24  # hours
+
+# Fired on the event bus when a zone's spill or turbo state changes.
+EVENT_SPILL_CHANGED = f"{DOMAIN}_spill_changed"
+EVENT_TURBO_CHANGED = f"{DOMAIN}_turbo_changed"
+
+# Last known state of each console, stored as <STORAGE_KEY>.<unique id>.
+STORAGE_KEY = DOMAIN
+STORAGE_VERSION = 1
+
+# Shared by all config entries, created when the integration is set up.
+DATA_SCHEDULER: HassKey[PollScheduler] = HassKey(DOMAIN)
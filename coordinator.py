@@ -2,30 +2,131 @@
 
 from __future__ import annotations
 
+from collections.abc import Hashable, Mapping
 from datetime import timedelta
+from ipaddress import IPv4Interface
 import logging
+import time
+from typing import Any
 
+from homeassistant.components import network
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .const import (
+    CONF_COMMAND_INTERVAL,
+    CONF_INFO_INTERVAL,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_TEMPERATURE_WINDOW,
+    DEFAULT_INFO_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_TEMPERATURE_WINDOW,
+    DOMAIN,
+    EVENT_SPILL_CHANGED,
+    EVENT_TURBO_CHANGED,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .discovery import DiscoveredConsole, async_discover, hosts_to_scan
+from .history import RollingWindow, SampleHistory
+from .scheduler import AdaptiveInterval, PollJob, PollScheduler
 from .zonetouch3 import (
+    DEFAULT_COMMAND_INTERVAL,
+    DEFAULT_PORT,
+    BreakerState,
+    LatencyStats,
+    PowerState,
+    ZoneCommandQueue,
+    ZoneCommand,
     ZoneStatus,
     ZoneTouch3Client,
     ZoneTouch3Error,
     ZoneTouchState,
+    diff_zones,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 SCAN_INTERVAL = timedelta(seconds=10)
+# While the persistent connection is up the console pushes every zone change,
+# so polling only has to catch anything that slipped through.
+PUSH_SCAN_INTERVAL = timedelta(minutes=1)
+# How often to look for the console at another address while it is offline.
+REDISCOVERY_INTERVAL = timedelta(minutes=10)
+# Changes are written to the store at most this often (seconds).
+SAVE_DELAY = 60
+
+# Listener contexts: fans listen with their zone number, sensors with one of
+# these. Listeners without a context are updated on every change.
+SYSTEM_CONTEXT = "system"
+METRICS_CONTEXT = "metrics"  # updated after every poll
+TEMPERATURE_CONTEXT = "temperature"  # updated with every temperature sample
+
+# Temperature samples held beyond what the window needs at the information
+# refresh interval, for refreshes requested in between.
+_EXTRA_TEMPERATURE_SAMPLES = 64
 
 type ZoneTouch3ConfigEntry = ConfigEntry[ZoneTouch3Coordinator]
 
 
+def state_store(hass: HomeAssistant, key: str) -> Store[dict[str, Any]]:
+    """The store of the last known state of the console with the given key.
+
+    The key is the config entry's unique ID (the system ID), or its entry
+    ID if the console did not report one.
+    """
+    return Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{key}")
+
+
+async def async_discover_consoles(
+    hass: HomeAssistant, port: int = DEFAULT_PORT
+) -> list[DiscoveredConsole]:
+    """Scan the subnets of Home Assistant's enabled network adapters."""
+    interfaces = [
+        IPv4Interface(f"{address['address']}/{address['network_prefix']}")
+        for adapter in await network.async_get_adapters(hass)
+        if adapter["enabled"]
+        for address in adapter["ipv4"]
+    ]
+    return await async_discover(hosts_to_scan(interfaces), port)
+
+
 class ZoneTouch3Coordinator(DataUpdateCoordinator[ZoneTouchState]):
-    """Polls the ZoneTouch 3 console and shares the state with all entities."""
+    """Tracks the ZoneTouch 3 console state and shares it with all entities.
+
+    State arrives from group status messages pushed over the client's
+    persistent connection, from the replies to control commands and from
+    polling, which slows down while the push connection is up. Polls are
+    run by the PollScheduler shared with the other consoles rather than by
+    the coordinator's own timer, at an AdaptiveInterval: faster for a while
+    after a command or a change, slower when idle or when the console
+    struggles.
+
+    Polls only fetch the zone status. Zone names and system information
+    rarely change, so they are refreshed on a much slower cadence, when a
+    new zone appears, or when a full refresh is requested. Every refresh of
+    the system information adds the console temperature to a SampleHistory,
+    which keeps its minimum, maximum, mean and rate of change over the
+    configured window.
+
+    Each new state is compared with the previous one and only the listeners
+    whose context changed are updated, so an unchanged poll writes no zone
+    states. Spill and turbo transitions are also fired as events.
+
+    The state is saved whenever zones or system information change, and
+    loaded on setup so entities can be created before the console answers.
+
+    While the console is unreachable, the local subnets are scanned for it
+    every REDISCOVERY_INTERVAL; if it turns up at a new address (e.g. from
+    DHCP), the config entry is updated, which reloads it.
+    """
 
     config_entry: ZoneTouch3ConfigEntry
 
@@ -40,26 +141,271 @@ class ZoneTouch3Coordinator(DataUpdateCoordinator[ZoneTouchState]):
             _LOGGER,
             config_entry=entry,
             name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
+            update_interval=None,  # polled by the shared PollScheduler
         )
         self.client = client
+        self.poll_interval = AdaptiveInterval(
+            SCAN_INTERVAL.total_seconds(),
+            entry.options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL),
+            entry.options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL),
+        )
+        self._poll_job: PollJob | None = None
+        # Control commands go through this queue so that rapid changes to a
+        # zone (e.g. dragging a slider) only send the latest setting.
+        self.commands = ZoneCommandQueue(
+            client,
+            entry.options.get(CONF_COMMAND_INTERVAL, DEFAULT_COMMAND_INTERVAL),
+        )
+        # Unload callbacks run last-registered first, so this runs before the
+        # client stops and no batch goes out for an unloaded entry.
+        entry.async_on_unload(self.commands.cancel)
+        self._info_interval = entry.options.get(
+            CONF_INFO_INTERVAL, DEFAULT_INFO_INTERVAL
+        )
+        self._info_updated: float | None = None  # time.monotonic() of last fetch
+        window = 3600 * entry.options.get(
+            CONF_TEMPERATURE_WINDOW, DEFAULT_TEMPERATURE_WINDOW
+        )
+        self.temperature_history = SampleHistory(
+            int(window // self._info_interval) + _EXTRA_TEMPERATURE_SAMPLES, (window,)
+        )
+        self.temperature_window: RollingWindow = self.temperature_history.window(
+            window
+        )
+        self._rediscovered: float | None = None  # time.monotonic() of last scan
+        self._store = state_store(hass, entry.unique_id or entry.entry_id)
+        self.poll_latency = LatencyStats()
+        self.poll_lag = LatencyStats()  # how late scheduled polls started
+        # Contexts changed since listeners were last updated; None updates all.
+        self._changed: set[Hashable] | None = None
+        self._listeners_saw_success: bool | None = None
+        entry.async_on_unload(client.add_status_listener(self.apply_zone_statuses))
+        entry.async_on_unload(
+            client.add_connection_listener(self._async_connection_changed)
+        )
+
+    async def async_load_stored_state(self) -> bool:
+        """Start from the last known state, if there is one.
+
+        The first poll then fetches everything, as on a first refresh.
+        """
+        if (stored := await self._store.async_load()) is None:
+            return False
+        try:
+            self.data = ZoneTouchState.from_dict(stored)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring unreadable stored ZoneTouch 3 state: %s", err)
+            return False
+        self._info_updated = None
+        return True
+
+    def start_polling(self, scheduler: PollScheduler) -> None:
+        """Have the shared scheduler poll at poll_interval."""
+        self._poll_job = scheduler.add(
+            self.async_refresh, self.poll_interval, self.poll_lag
+        )
+        self.config_entry.async_on_unload(self._poll_job.cancel)
 
     async def _async_update_data(self) -> ZoneTouchState:
+        start = time.monotonic()
         try:
-            return await self.client.async_get_state()
+            state = await self._async_poll()
         except ZoneTouch3Error as err:
+            self.poll_interval.record_poll(False, time.monotonic() - start)
+            self._async_maybe_rediscover()
             raise UpdateFailed(f"Error communicating with ZoneTouch 3: {err}") from err
+        duration = time.monotonic() - start
+        self.poll_latency.add(duration)
+        self.poll_interval.record_poll(True, duration)
+        self._track_changes(state)
+        self._add_changed(METRICS_CONTEXT)
+        return state
+
+    async def _async_poll(self) -> ZoneTouchState:
+        if not self._info_due():
+            zones = await self.client.async_get_zones()
+            if zones.keys() <= self.data.zones.keys():
+                return self.data.with_status(zones)
+            _LOGGER.debug("New zone reported, fetching names")
+        state = await self.client.async_get_state()
+        self._info_updated = time.monotonic()
+        if (temperature := state.system.temperature) is not None:
+            self.temperature_history.add(self._info_updated, temperature)
+            self._add_changed(TEMPERATURE_CONTEXT)
+        return state if self.data is None else self.data.reuse_unchanged(state)
+
+    def _info_due(self) -> bool:
+        return (
+            self.data is None
+            or self._info_updated is None
+            or time.monotonic() - self._info_updated >= self._info_interval
+        )
+
+    @callback
+    def _async_maybe_rediscover(self) -> None:
+        """Look for the console elsewhere once the breaker gives up on it."""
+        now = time.monotonic()
+        if (
+            self.config_entry.unique_id is None
+            or self.client.breaker.state is not BreakerState.OPEN
+            or (
+                self._rediscovered is not None
+                and now - self._rediscovered < REDISCOVERY_INTERVAL.total_seconds()
+            )
+        ):
+            return
+        self._rediscovered = now
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_rediscover(), "zonetouch3_rediscover"
+        )
+
+    async def _async_rediscover(self) -> None:
+        entry = self.config_entry
+        consoles = await async_discover_consoles(self.hass, entry.data[CONF_PORT])
+        for console in consoles:
+            if console.system.system_id != entry.unique_id:
+                continue
+            if console.host == entry.data[CONF_HOST]:
+                return  # answering again at the same address
+            _LOGGER.info(
+                "ZoneTouch 3 %s moved from %s to %s",
+                console.system.name or entry.unique_id,
+                entry.data[CONF_HOST],
+                console.host,
+            )
+            self.hass.config_entries.async_update_entry(
+                entry,
+                data={**entry.data, CONF_HOST: console.host, CONF_PORT: console.port},
+            )
+            return
+
+    async def async_request_full_refresh(self) -> None:
+        """Refresh zone names and system information along with the status."""
+        self._info_updated = None
+        await self.async_request_refresh()
+
+    async def async_set_zones(self, commands: Mapping[int, ZoneCommand]) -> None:
+        """Control several zones with one message and apply the reply."""
+        self.note_activity()
+        try:
+            zones = await self.commands.async_set_zones(commands)
+        except ZoneTouch3Error as err:
+            raise HomeAssistantError(
+                f"Failed to control ZoneTouch 3 zones: {err}"
+            ) from err
+        self.apply_zone_statuses(zones)
 
+    @callback
     def apply_zone_statuses(self, zones: dict[int, ZoneStatus]) -> None:
-        """Merge the group status a control command returned into the data.
+        """Merge a group status message into the data.
 
         The device answers every control command with a full group status
-        message, so entities update immediately instead of waiting for the
-        next poll. Names are not part of that message and are carried over.
+        message and pushes one whenever a zone changes at the wall, so
+        entities update immediately instead of waiting for the next poll.
+        Names are not part of that message and are carried over; zones
+        that did not change keep their existing objects.
         """
-        for number, status in zones.items():
-            existing = self.data.zones.get(number)
-            if existing is not None:
-                status.name = existing.name
-            self.data.zones[number] = status
-        self.async_set_updated_data(self.data)
+        if self.data is None:
+            return  # pushed before the first refresh; that refresh covers it
+        if not zones.keys() <= self.data.zones.keys():
+            self.config_entry.async_create_background_task(
+                self.hass, self.async_request_full_refresh(), "zonetouch3_names"
+            )
+        state = self.data.with_status(zones, merge=True)
+        self._track_changes(state)
+        self.async_set_updated_data(state)
+
+    def _track_changes(self, state: ZoneTouchState) -> None:
+        """Note which contexts differ between the current data and state."""
+        if self.data is None:
+            self._async_save()
+            return  # first refresh; everything is new
+        if state is self.data:
+            self._add_changed()
+            return
+        # Unchanged parts of a state are shared with the previous one, so
+        # identity tells what stayed the same.
+        changes = diff_zones(self.data.zones, state.zones)
+        self._add_changed(*changes)
+        if changes:
+            self.note_activity()
+        if state.system is not self.data.system:
+            self._add_changed(SYSTEM_CONTEXT)
+        if changes or state.system is not self.data.system:
+            self._async_save()
+        for number, changed in changes.items():
+            before, after = self.data.zones.get(number), state.zones.get(number)
+            if before is None or after is None:
+                continue
+            if "spill_active" in changed:
+                self._fire_zone_event(
+                    EVENT_SPILL_CHANGED, after, spill_active=after.spill_active
+                )
+            turbo = after.power is PowerState.TURBO
+            if "power" in changed and turbo != (before.power is PowerState.TURBO):
+                self._fire_zone_event(EVENT_TURBO_CHANGED, after, turbo=turbo)
+
+    @callback
+    def _async_save(self) -> None:
+        """Save the data soon; changes in the meantime are saved with it."""
+        self._store.async_delay_save(lambda: self.data.as_dict(), SAVE_DELAY)
+
+    @callback
+    def note_activity(self) -> None:
+        """Poll faster for a while after a command or a change."""
+        self.poll_interval.activity()
+        if self._poll_job is not None:
+            self._poll_job.reschedule()
+
+    def _add_changed(self, *contexts: Hashable) -> None:
+        if self._changed is None:
+            self._changed = set(contexts)
+        else:
+            self._changed.update(contexts)
+
+    def _fire_zone_event(self, event_type: str, zone: ZoneStatus, **data: bool) -> None:
+        device_id = self.config_entry.unique_id or self.config_entry.entry_id
+        entity_id = er.async_get(self.hass).async_get_entity_id(
+            "fan", DOMAIN, f"{device_id}_zone_{zone.number}"
+        )
+        self.hass.bus.async_fire(
+            event_type,
+            {
+                "entity_id": entity_id,
+                "zone": zone.number,
+                "name": zone.name,
+                **data,
+            },
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners whose context changed.
+
+        Everything is updated on the first refresh and whenever the success of
+        the last update flips, since that changes every entity's availability.
+        """
+        changed, self._changed = self._changed, None
+        if changed is None or self.last_update_success != self._listeners_saw_success:
+            self._listeners_saw_success = self.last_update_success
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    @callback
+    def _async_connection_changed(self, connected: bool) -> None:
+        """Poll less often while pushed status keeps the data current."""
+        # Pushed status already keeps the data fresh after a change.
+        interval = PUSH_SCAN_INTERVAL if connected else SCAN_INTERVAL
+        self.poll_interval.set_base(
+            interval.total_seconds(), fast_polling=not connected
+        )
+        if self._poll_job is not None:
+            self._poll_job.reschedule()
+        if connected and self.data is not None:
+            # Zones may have changed while the connection was down.
+            self.config_entry.async_create_background_task(
+                self.hass, self.async_request_refresh(), "zonetouch3_resync"
+            )
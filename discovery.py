@@ -0,0 +1,101 @@
+"""Discovery of ZoneTouch 3 consoles on the local network.
+
+Consoles do not announce themselves, so discovery scans the local subnets:
+every address gets a TCP connection attempt on the console port with a short
+timeout, many at once, and the addresses that accept are asked for group
+status and system information. Only devices that answer like a console are
+reported, once per system ID. A /24 takes about as long as two connect
+timeouts, or CONFIRM_TIMEOUT if some other device accepts connections on
+the port.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from contextlib import suppress
+from dataclasses import dataclass
+from ipaddress import IPv4Interface, IPv4Network
+import logging
+
+try:
+    from . import zonetouch3 as zt
+except ImportError:  # used outside Home Assistant
+    import zonetouch3 as zt  # type: ignore[no-redef]
+
+_LOGGER = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 0.75  # consoles on the local network accept well within this
+CONFIRM_TIMEOUT = 2.0
+MAX_CONCURRENT = 128
+# Larger networks are only scanned in the /24 around the local address.
+MAX_SCAN_ADDRESSES = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class DiscoveredConsole:
+    """A console found on the network."""
+
+    host: str
+    port: int
+    system: zt.SystemInfo
+
+
+def hosts_to_scan(interfaces: Iterable[IPv4Interface]) -> list[str]:
+    """The addresses to scan for the given local interfaces, without their own.
+
+    Loopback and link-local interfaces are skipped.
+    """
+    interfaces = list(interfaces)
+    own = {interface.ip for interface in interfaces}
+    hosts: dict[str, None] = {}  # ordered, without duplicates
+    for interface in interfaces:
+        if interface.ip.is_loopback or interface.ip.is_link_local:
+            continue
+        network: IPv4Network = interface.network
+        if network.num_addresses > MAX_SCAN_ADDRESSES:
+            network = IPv4Interface(f"{interface.ip}/24").network
+        for address in network.hosts():
+            if address not in own:
+                hosts[str(address)] = None
+    return list(hosts)
+
+
+async def async_discover(
+    hosts: Iterable[str],
+    port: int = zt.DEFAULT_PORT,
+    *,
+    connect_timeout: float = CONNECT_TIMEOUT,
+    max_concurrent: int = MAX_CONCURRENT,
+) -> list[DiscoveredConsole]:
+    """Scan hosts for consoles; at most max_concurrent are probed at once.
+
+    Consoles reporting the same system ID (e.g. on two interfaces) are
+    reported once, at the first address in hosts.
+    """
+    slots = asyncio.Semaphore(max_concurrent)
+
+    async def probe(host: str) -> DiscoveredConsole | None:
+        async with slots:
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port), connect_timeout
+                )
+            except (OSError, TimeoutError):
+                return None
+            writer.close()
+            with suppress(OSError):
+                await writer.wait_closed()
+            client = zt.ZoneTouch3Client(host, port, timeout=CONFIRM_TIMEOUT)
+            try:
+                system = await client.async_identify()
+            except zt.ZoneTouch3Error as err:
+                _LOGGER.debug("%s:%s is not a ZoneTouch 3: %s", host, port, err)
+                return None
+        return DiscoveredConsole(host, port, system)
+
+    consoles: dict[str, DiscoveredConsole] = {}
+    for console in await asyncio.gather(*(probe(host) for host in hosts)):
+        if console is not None:
+            consoles.setdefault(console.system.system_id or console.host, console)
+    return list(consoles.values())
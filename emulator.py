@@ -0,0 +1,300 @@
+"""Local emulator of a Polyaire ZoneTouch 3 console.
+
+An asyncio TCP server speaking the framing implemented in zonetouch3.py, for
+exercising ZoneTouch3Client and measuring it without hardware. It answers
+group status (0x21), group control (0x20, any number of repeat entries),
+group names (0xFF 0x13) and system information (0xFF 0xF0) requests, and can
+push unsolicited group status messages the way a console does after a change
+at the wall.
+
+Firmware variations the client has to cope with can be selected: the order
+of the repeat count and repeat length fields in group status messages, and
+whether the CRC covers stuffed bytes. A response latency can be added to
+mimic the console's slow Wi-Fi.
+
+Run it standalone with ``python emulator.py --zones 8`` and point the
+integration (or anything else using ZoneTouch3Client) at the printed port.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import logging
+
+try:
+    from . import zonetouch3 as zt
+except ImportError:  # run as a script, outside Home Assistant
+    import zonetouch3 as zt  # type: ignore[no-redef]
+
+_LOGGER = logging.getLogger(__name__)
+
+NAME_LENGTH = 13
+_GROUP_STATUS_LENGTH = 8
+_GROUP_CONTROL = bytes((zt.SUBTYPE_GROUP_CONTROL,))
+
+
+@dataclass
+class EmulatedZone:
+    """State of one emulated zone."""
+
+    number: int
+    name: str
+    power: zt.PowerState = zt.PowerState.ON
+    percentage: int = 100
+    turbo_supported: bool = False
+    spill_active: bool = False
+
+
+class ZoneTouch3Emulator:
+    """Asyncio TCP server that behaves like a ZoneTouch 3 console."""
+
+    def __init__(
+        self,
+        zone_count: int = 8,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        spec_field_order: bool = False,
+        crc_includes_stuffing: bool = True,
+        latency: float = 0.0,
+        system: zt.SystemInfo | None = None,
+    ) -> None:
+        """Create an emulator; port 0 picks a free port when started.
+
+        spec_field_order sends group status with the repeat count before the
+        repeat length, as the spec documents, instead of the order real
+        firmware uses. crc_includes_stuffing selects which of the two CRC
+        variants responses carry. latency delays every response.
+        """
+        if not 1 <= zone_count <= 16:
+            raise ValueError(f"Zone count must be 1-16, got {zone_count}")
+        self.zones = {
+            number: EmulatedZone(number, f"Zone {number + 1}")
+            for number in range(zone_count)
+        }
+        self.system = system or zt.SystemInfo(
+            system_id="24000001",
+            name="Emulated ZT3",
+            installer="Polyaire",
+            installer_phone="0000000000",
+            firmware_version="1.0.0",
+            console_version="1.0.0",
+            temperature=22.5,
+        )
+        self.spec_field_order = spec_field_order
+        self.crc_includes_stuffing = crc_includes_stuffing
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self._host = host
+        self._port = port
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    @property
+    def port(self) -> int:
+        """The port the emulator listens on."""
+        if self._server is None:
+            return self._port
+        return self._server.sockets[0].getsockname()[1]
+
+    async def async_start(self) -> None:
+        """Start listening for connections."""
+        self._server = await asyncio.start_server(
+            self._handle, self._host, self._port
+        )
+
+    async def async_stop(self) -> None:
+        """Close all connections and stop listening."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    def set_zone(
+        self,
+        number: int,
+        *,
+        power: zt.PowerState | None = None,
+        percentage: int | None = None,
+        spill_active: bool | None = None,
+    ) -> None:
+        """Change a zone as if from the wall console and push the new status."""
+        zone = self.zones[number]
+        if power is not None:
+            zone.power = power
+        if percentage is not None:
+            zone.percentage = percentage
+        if spill_active is not None:
+            zone.spill_active = spill_active
+        self.push_status()
+
+    def push_status(self) -> None:
+        """Send an unsolicited group status message to every client."""
+        frame = self.group_status_frame()
+        for writer in self._writers:
+            writer.write(frame)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        decoder = zt.FrameDecoder()
+        loop = asyncio.get_running_loop()
+        try:
+            while chunk := await reader.read(4096):
+                for _, msg_type, data in decoder.feed(chunk):
+                    self.requests += 1
+                    if (response := self._respond(msg_type, data)) is None:
+                        _LOGGER.debug("No response to type 0x%02X", msg_type)
+                    elif self.latency:
+                        loop.call_later(self.latency, self._send, writer, response)
+                    else:
+                        writer.write(response)
+        except OSError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _send(self, writer: asyncio.StreamWriter, frame: bytes) -> None:
+        if not writer.is_closing():
+            writer.write(frame)
+
+    def _respond(self, msg_type: int, data: bytes) -> bytes | None:
+        # Requests use the same message type and sub type as the responses.
+        if zt._is_group_status(msg_type, data):
+            return self.group_status_frame()
+        if msg_type == zt.TYPE_CONTROL and data[:1] == _GROUP_CONTROL:
+            self._apply_group_control(data)
+            return self.group_status_frame()
+        if zt._is_group_names(msg_type, data):
+            return self.group_names_frame()
+        if zt._is_system_info(msg_type, data):
+            return self.system_info_frame()
+        return None
+
+    def _apply_group_control(self, data: bytes) -> None:
+        common_length = int.from_bytes(data[2:4], "big")
+        field_a = int.from_bytes(data[4:6], "big")
+        field_b = int.from_bytes(data[6:8], "big")
+        start = 8 + common_length
+        # Accept both field orders, like the console's status messages.
+        each_length, count = field_a, field_b
+        if each_length * count != len(data) - start:
+            count, each_length = field_a, field_b
+        for offset in range(start, start + count * each_length, each_length):
+            entry = data[offset : offset + each_length]
+            if (zone := self.zones.get(entry[0] & 0x3F)) is None:
+                continue
+            power = entry[1] & 0b111
+            if power == zt.PowerCommand.NEXT:
+                on = zone.power is not zt.PowerState.OFF
+                zone.power = zt.PowerState.OFF if on else zt.PowerState.ON
+            elif power == zt.PowerCommand.OFF:
+                zone.power = zt.PowerState.OFF
+            elif power == zt.PowerCommand.ON:
+                zone.power = zt.PowerState.ON
+            elif power == zt.PowerCommand.TURBO and zone.turbo_supported:
+                zone.power = zt.PowerState.TURBO
+            if entry[1] & zt.SETTING_SET_PERCENTAGE and entry[2] <= 100:
+                zone.percentage = entry[2]
+
+    def group_status_frame(self) -> bytes:
+        """Encode the current zone state as a group status message."""
+        count = len(self.zones).to_bytes(2, "big")
+        length = _GROUP_STATUS_LENGTH.to_bytes(2, "big")
+        data = bytearray((zt.SUBTYPE_GROUP_STATUS, 0x00, 0x00, 0x00))
+        data += count + length if self.spec_field_order else length + count
+        for zone in self.zones.values():
+            data += bytes(
+                (
+                    zone.power << 6 | zone.number,
+                    zone.percentage,
+                    0x00, 0x00, 0x00, 0x00,
+                    zone.turbo_supported << 7 | zone.spill_active << 1,
+                    0x00,
+                )
+            )
+        return self._frame(zt.ADDRESS_CONTROL, zt.TYPE_CONTROL, bytes(data))
+
+    def group_names_frame(self) -> bytes:
+        """Encode the zone names as a group names message."""
+        data = bytearray(zt.EXTENDED_GROUP_NAMES + bytes((NAME_LENGTH,)))
+        for zone in self.zones.values():
+            data.append(zone.number)
+            data += zone.name.encode()[:NAME_LENGTH].ljust(NAME_LENGTH, b"\x00")
+        return self._frame(zt.ADDRESS_EXTENDED, zt.TYPE_EXTENDED, bytes(data))
+
+    def system_info_frame(self) -> bytes:
+        """Encode the system information in the 0xFF 0xF0 layout."""
+        offset, length = zt._INFO_CONSOLE_VERSION  # the last field
+        data = bytearray(offset + length)
+        data[:2] = zt.EXTENDED_SYSTEM_INFO
+        for (offset, length), text in (
+            (zt._INFO_SYSTEM_ID, self.system.system_id),
+            (zt._INFO_SYSTEM_NAME, self.system.name),
+            (zt._INFO_INSTALLER, self.system.installer),
+            (zt._INFO_INSTALLER_PHONE, self.system.installer_phone),
+            (zt._INFO_FIRMWARE_VERSION, self.system.firmware_version),
+            (zt._INFO_CONSOLE_VERSION, self.system.console_version),
+        ):
+            data[offset : offset + length] = text.encode()[:length].ljust(
+                length, b"\x00"
+            )
+        if self.system.temperature is not None:
+            offset, length = zt._INFO_CONSOLE_TEMP
+            raw_temp = round(self.system.temperature * 10) + 500
+            data[offset : offset + length] = raw_temp.to_bytes(length, "big")
+        return self._frame(zt.ADDRESS_EXTENDED, zt.TYPE_EXTENDED, bytes(data))
+
+    def _frame(self, address: bytes, msg_type: int, data: bytes) -> bytes:
+        if self.crc_includes_stuffing:
+            return zt.build_message(address, msg_type, data)
+        body = address + bytes((zt.MESSAGE_ID, msg_type)) + len(data).to_bytes(2, "big")
+        body += data
+        return zt.HEADER + zt._stuff(body) + zt._crc16(body)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    emulator = ZoneTouch3Emulator(
+        args.zones,
+        host=args.host,
+        port=args.port,
+        spec_field_order=args.spec_field_order,
+        crc_includes_stuffing=not args.unstuffed_crc,
+        latency=args.latency,
+    )
+    await emulator.async_start()
+    print(f"Emulating a ZoneTouch 3 with {args.zones} zones on port {emulator.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await emulator.async_stop()
+
+
+def main() -> None:
+    """Run the emulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=zt.DEFAULT_PORT)
+    parser.add_argument("--zones", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--spec-field-order", action="store_true")
+    parser.add_argument("--unstuffed-crc", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
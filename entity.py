@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Hashable
+
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -14,8 +16,11 @@ class ZoneTouch3Entity(CoordinatorEntity[ZoneTouch3Coordinator]):
 
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator: ZoneTouch3Coordinator) -> None:
-        super().__init__(coordinator)
+    def __init__(
+        self, coordinator: ZoneTouch3Coordinator, context: Hashable = None
+    ) -> None:
+        """Set up the entity; it is only updated when its context changes."""
+        super().__init__(coordinator, context)
         entry = coordinator.config_entry
         system = coordinator.data.system
         self._device_id = entry.unique_id or entry.entry_id
@@ -9,12 +9,16 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .const import CONF_OPTIMISTIC
 from .coordinator import ZoneTouch3ConfigEntry, ZoneTouch3Coordinator
 from .entity import ZoneTouch3Entity
 from .zonetouch3 import PowerCommand, PowerState, ZoneStatus, ZoneTouch3Error
 
 PRESET_TURBO = "turbo"
 PERCENTAGE_STEP = 5  # the console adjusts the open percentage in 5% steps
+# How far the reported percentage may be from the requested one, since the
+# console rounds to its steps.
+PERCENTAGE_TOLERANCE = PERCENTAGE_STEP
 
 
 async def async_setup_entry(
@@ -30,15 +34,27 @@ async def async_setup_entry(
 
 
 class ZoneTouch3Fan(ZoneTouch3Entity, FanEntity):
-    """A single ZoneTouch 3 zone damper."""
+    """A single ZoneTouch 3 zone damper.
+
+    In optimistic mode a command shows the requested state at once. It is
+    replaced by the group status the console replies with; if the command
+    fails or the reply does not match the request, the action fails.
+    """
 
     _attr_icon = "mdi:air-conditioner"
     _attr_speed_count = 100 // PERCENTAGE_STEP
 
     def __init__(self, coordinator: ZoneTouch3Coordinator, zone_number: int) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, zone_number)
         self._zone_number = zone_number
         self._attr_unique_id = f"{self._device_id}_zone_{zone_number}"
+        self._optimistic = coordinator.config_entry.options.get(
+            CONF_OPTIMISTIC, False
+        )
+        # The requested status while a command is in flight in optimistic
+        # mode. Only the latest command (see _command_seq) may clear it.
+        self._assumed: ZoneStatus | None = None
+        self._command_seq = 0
 
         features = (
             FanEntityFeature.SET_SPEED
@@ -52,6 +68,8 @@ class ZoneTouch3Fan(ZoneTouch3Entity, FanEntity):
 
     @property
     def _zone(self) -> ZoneStatus | None:
+        if self._assumed is not None:
+            return self._assumed
         return self.coordinator.data.zones.get(self._zone_number)
 
     @property
@@ -122,12 +140,37 @@ class ZoneTouch3Fan(ZoneTouch3Entity, FanEntity):
     async def _async_control(
         self, power: PowerCommand = PowerCommand.KEEP, percentage: int | None = None
     ) -> None:
+        self.coordinator.note_activity()
+        self._command_seq += 1
+        seq = self._command_seq
+        expected: ZoneStatus | None = None
+        if self._optimistic and (zone := self._zone) is not None:
+            # Built on the assumed status of any earlier command still in
+            # flight, since the command queue merges them the same way.
+            expected = self._assumed = zone.after_command(power, percentage)
+            self.async_write_ha_state()
         try:
-            zones = await self.coordinator.client.async_set_zone(
+            zones = await self.coordinator.commands.async_set_zone(
                 self._zone_number, power=power, percentage=percentage
             )
         except ZoneTouch3Error as err:
             raise HomeAssistantError(
                 f"Failed to control zone {self.name}: {err}"
             ) from err
-        self.coordinator.apply_zone_statuses(zones)
+        else:
+            self.coordinator.apply_zone_statuses(zones)
+        finally:
+            if seq == self._command_seq and self._assumed is not None:
+                self._assumed = None
+                self.async_write_ha_state()
+        if expected is None or seq != self._command_seq:
+            return  # not optimistic, or superseded by a later command
+        actual = zones.get(self._zone_number)
+        if (
+            actual is None
+            or actual.power is not expected.power
+            or abs(actual.percentage - expected.percentage) > PERCENTAGE_TOLERANCE
+        ):
+            raise HomeAssistantError(
+                f"The console did not change zone {self.name} as requested"
+            )
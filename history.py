@@ -0,0 +1,133 @@
+"""Rolling statistics over a ring buffer of timestamped samples.
+
+SampleHistory keeps the most recent samples in two fixed-size arrays (time
+and value) used as a ring buffer, and maintains, for each of a number of
+time windows, the minimum, maximum, mean and rate of change of the samples
+inside it. Each window keeps a running sum and monotonic deques of sample
+indices for the minimum and maximum, so adding a sample costs amortised O(1)
+per window and reading a statistic is O(1); nothing ever scans the history.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from collections.abc import Iterable
+
+
+class RollingWindow:
+    """Statistics of the samples of a SampleHistory in the last seconds."""
+
+    __slots__ = ("_history", "_maxima", "_minima", "_sum", "first", "seconds")
+
+    def __init__(self, history: SampleHistory, seconds: float) -> None:
+        self._history = history
+        self.seconds = seconds
+        self.first = 0  # index of the oldest sample in the window
+        self._sum = 0.0
+        # Indices of candidate minima (values increasing) and maxima
+        # (values decreasing); the front is the current minimum or maximum.
+        self._minima: deque[int] = deque()
+        self._maxima: deque[int] = deque()
+
+    def __len__(self) -> int:
+        return self._history.end - self.first
+
+    @property
+    def minimum(self) -> float | None:
+        """Lowest value in the window, None if it is empty."""
+        return self._history.value(self._minima[0]) if self._minima else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Highest value in the window, None if it is empty."""
+        return self._history.value(self._maxima[0]) if self._maxima else None
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of the values in the window, None if it is empty."""
+        return self._sum / len(self) if len(self) else None
+
+    def rate(self, per: float = 3600.0) -> float | None:
+        """Change from the oldest to the newest sample per `per` seconds.
+
+        None unless the window holds samples at two different times.
+        """
+        history = self._history
+        if len(self) < 2:
+            return None
+        newest = history.end - 1
+        elapsed = history.time(newest) - history.time(self.first)
+        if elapsed <= 0:
+            return None
+        return (history.value(newest) - history.value(self.first)) / elapsed * per
+
+    def _add(self, index: int, value: float) -> None:
+        value_at = self._history.value
+        self._sum += value
+        while self._minima and value_at(self._minima[-1]) >= value:
+            self._minima.pop()
+        self._minima.append(index)
+        while self._maxima and value_at(self._maxima[-1]) <= value:
+            self._maxima.pop()
+        self._maxima.append(index)
+
+    def _expire(self, cutoff: float, before: int) -> None:
+        """Drop samples older than cutoff, and any with an index below before."""
+        history = self._history
+        while self.first < history.end and (
+            self.first < before or history.time(self.first) < cutoff
+        ):
+            self._sum -= history.value(self.first)
+            if self._minima[0] == self.first:
+                self._minima.popleft()
+            if self._maxima[0] == self.first:
+                self._maxima.popleft()
+            self.first += 1
+        if not len(self):
+            self._sum = 0.0  # no rounding errors left behind
+
+
+class SampleHistory:
+    """Fixed-size history of (time, value) samples with rolling windows.
+
+    Samples must be added in time order. Once capacity samples are held the
+    oldest is overwritten, so a window longer than capacity samples cover
+    only reports on the samples still held.
+    """
+
+    def __init__(self, capacity: int, windows: Iterable[float]) -> None:
+        if capacity < 2:
+            raise ValueError(f"Capacity must be at least 2, got {capacity}")
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self.end = 0  # index the next sample gets; indices only ever grow
+        self.windows = {seconds: RollingWindow(self, seconds) for seconds in windows}
+
+    def __len__(self) -> int:
+        return min(self.end, self.capacity)
+
+    def time(self, index: int) -> float:
+        """Time of the sample with the given index."""
+        return self._times[index % self.capacity]
+
+    def value(self, index: int) -> float:
+        """Value of the sample with the given index."""
+        return self._values[index % self.capacity]
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Record a sample and update every window."""
+        oldest = self.end + 1 - self.capacity  # first sample still held after
+        for window in self.windows.values():
+            window._expire(timestamp - window.seconds, oldest)
+        slot = self.end % self.capacity
+        self._times[slot] = timestamp
+        self._values[slot] = value
+        self.end += 1
+        for window in self.windows.values():
+            window._add(self.end - 1, value)
+
+    def window(self, seconds: float) -> RollingWindow:
+        """The window of the given length, as passed to the constructor."""
+        return self.windows[seconds]
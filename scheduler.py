@@ -0,0 +1,193 @@
+"""Shared poll scheduler for all ZoneTouch 3 consoles.
+
+One PollScheduler runs the periodic polls of every config entry. Polls are
+given evenly spaced phases within their interval, so consoles set up at the
+same moment (e.g. after a restart) are not polled in lockstep, and at most
+max_concurrent polls run at once. The delay between the time a poll was due
+and the time it actually started is recorded as scheduling lag.
+
+AdaptiveInterval works out how long each console waits between polls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import random
+import time
+
+try:
+    from .zonetouch3 import LatencyStats
+except ImportError:  # used outside Home Assistant
+    from zonetouch3 import LatencyStats  # type: ignore[no-redef]
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 2
+
+FAST_WINDOW = 60.0  # seconds of fast polling after activity
+IDLE_AFTER = 1800.0  # seconds without activity before backing off
+MAX_IDLE_FACTOR = 4  # idle backoff multiplies the base interval up to this
+SLOW_POLL = 2.0  # seconds; a poll taking longer doubles the interval
+JITTER = 0.1  # +/- fraction of the interval
+
+
+class PollJob:
+    """A periodic poll registered with a PollScheduler."""
+
+    def __init__(
+        self,
+        scheduler: PollScheduler,
+        poll: Callable[[], Awaitable[object]],
+        interval: Callable[[], float],
+        lag: LatencyStats,
+    ) -> None:
+        self._scheduler = scheduler
+        self._poll = poll
+        self._interval = interval
+        self.lag = lag
+        self.phase = 0.0  # fraction of the interval, set by the scheduler
+        self._last = asyncio.get_running_loop().time()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def reschedule(self) -> None:
+        """Recompute the next due time, e.g. after the interval changed."""
+        self._wake.set()
+
+    def cancel(self) -> None:
+        """Stop polling and unregister from the scheduler."""
+        self._scheduler._remove(self)
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _next_due(self, now: float) -> float:
+        interval = self._interval()
+        # At least half an interval after the last poll even if the phase
+        # moved, then on the next time slot of this job's phase.
+        base = max(now, self._last + interval / 2)
+        return base + (self.phase * interval - base) % interval
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wake.clear()
+            due = self._next_due(loop.time())
+            try:
+                async with asyncio.timeout_at(due):
+                    await self._wake.wait()
+                continue  # rescheduled
+            except TimeoutError:
+                pass
+            async with self._scheduler._slots:
+                self._last = start = loop.time()
+                self.lag.add(start - due)
+                if start - due > self._interval():
+                    _LOGGER.debug("Poll started %.1f s late", start - due)
+                try:
+                    await self._poll()
+                except Exception:
+                    _LOGGER.exception("Unexpected error polling ZoneTouch 3")
+
+
+class PollScheduler:
+    """Staggers periodic polls and limits how many run at once."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT) -> None:
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._jobs: list[PollJob] = []
+
+    def add(
+        self,
+        poll: Callable[[], Awaitable[object]],
+        interval: Callable[[], float],
+        lag: LatencyStats | None = None,
+    ) -> PollJob:
+        """Start calling poll every interval() seconds, from now on.
+
+        The first poll is at least half an interval away; the caller is
+        expected to have just fetched the state. Scheduling lag is recorded
+        in lag if given. Call cancel() on the returned job to stop.
+        """
+        job = PollJob(self, poll, interval, lag or LatencyStats())
+        self._jobs.append(job)
+        self._respace()
+        job._task = asyncio.get_running_loop().create_task(
+            job._run(), name="zonetouch3_poll"
+        )
+        return job
+
+    def _remove(self, job: PollJob) -> None:
+        if job in self._jobs:
+            self._jobs.remove(job)
+            self._respace()
+
+    def _respace(self) -> None:
+        """Spread the jobs' phases evenly over the interval."""
+        for index, job in enumerate(self._jobs):
+            job.phase = index / len(self._jobs)
+            job.reschedule()
+
+
+class AdaptiveInterval:
+    """Poll interval that follows activity and console health.
+
+    The interval is the base interval, except:
+
+    - for FAST_WINDOW seconds after activity (a command, or a change seen
+      at the console) it drops to the minimum, when fast polling is allowed;
+    - after IDLE_AFTER seconds without activity it doubles for every further
+      IDLE_AFTER seconds, up to MAX_IDLE_FACTOR times the base;
+    - it doubles for every consecutive failed poll, and once more if the
+      last poll was slower than SLOW_POLL.
+
+    The result is kept within the minimum and maximum and then varied by
+    +/- JITTER so consoles do not drift into lockstep. It is recomputed only
+    when something changes, so repeated reads give the same value.
+    """
+
+    def __init__(self, base: float, minimum: float, maximum: float) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self._base = base
+        self._fast_polling = True
+        self._active_until = 0.0
+        self._last_activity = time.monotonic()
+        self._failures = 0
+        self._slow = False
+        self._update()
+
+    def __call__(self) -> float:
+        """The current interval in seconds."""
+        return self._interval
+
+    def set_base(self, base: float, *, fast_polling: bool = True) -> None:
+        """Change the normal interval and whether activity speeds it up."""
+        self._base = base
+        self._fast_polling = fast_polling
+        self._update()
+
+    def activity(self) -> None:
+        """Note a command or a change, starting a window of fast polling."""
+        self._last_activity = time.monotonic()
+        self._active_until = self._last_activity + FAST_WINDOW
+        self._update()
+
+    def record_poll(self, ok: bool, duration: float) -> None:
+        """Note the outcome and duration of a poll."""
+        self._failures = 0 if ok else self._failures + 1
+        self._slow = duration > SLOW_POLL
+        self._update()
+
+    def _update(self) -> None:
+        now = time.monotonic()
+        if self._fast_polling and now < self._active_until:
+            interval = self.minimum
+        else:
+            idle_periods = int((now - self._last_activity) // IDLE_AFTER)
+            interval = self._base * min(2**idle_periods, MAX_IDLE_FACTOR)
+        interval *= 2 ** min(self._failures + self._slow, 10)
+        interval = min(max(interval, self.minimum), self.maximum)
+        self._interval = interval * random.uniform(1 - JITTER, 1 + JITTER)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -11,20 +12,84 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import EntityCategory, UnitOfTemperature
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .coordinator import ZoneTouch3ConfigEntry, ZoneTouch3Coordinator
+from .coordinator import (
+    METRICS_CONTEXT,
+    SYSTEM_CONTEXT,
+    TEMPERATURE_CONTEXT,
+    ZoneTouch3ConfigEntry,
+    ZoneTouch3Coordinator,
+)
 from .entity import ZoneTouch3Entity
-from .zonetouch3 import ZoneTouchState
+from .history import RollingWindow
+from .zonetouch3 import (
+    BreakerState,
+    LatencyStats,
+    Priority,
+    control_frame_cache_stats,
+)
 
 
 @dataclass(frozen=True, kw_only=True)
 class ZoneTouch3SensorDescription(SensorEntityDescription):
     """Describes a ZoneTouch 3 sensor."""
 
-    value_fn: Callable[[ZoneTouchState], float | str | None]
+    value_fn: Callable[[ZoneTouch3Coordinator], float | str | None]
+    attributes_fn: Callable[[ZoneTouch3Coordinator], dict[str, Any]] | None = None
+    # The coordinator only updates the sensor when this context changes.
+    context: str = SYSTEM_CONTEXT
+
+
+def _temperature_window_attributes(
+    coordinator: ZoneTouch3Coordinator,
+) -> dict[str, Any]:
+    window = coordinator.temperature_window
+    return {"window_hours": window.seconds / 3600, "samples": len(window)}
+
+
+def _temperature_statistic(
+    key: str, value_fn: Callable[[RollingWindow], float | None]
+) -> ZoneTouch3SensorDescription:
+    """Describe a sensor showing a statistic of the recent temperature."""
+    return ZoneTouch3SensorDescription(
+        key=key,
+        translation_key=key,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=1,
+        value_fn=lambda coordinator: value_fn(coordinator.temperature_window),
+        attributes_fn=_temperature_window_attributes,
+        context=TEMPERATURE_CONTEXT,
+    )
+
+
+def _latency_sensor(
+    key: str, stats_fn: Callable[[ZoneTouch3Coordinator], LatencyStats], **kwargs: Any
+) -> ZoneTouch3SensorDescription:
+    """Describe a sensor showing the p95 of a latency, with p50/p99 attributes."""
+    return ZoneTouch3SensorDescription(
+        key=key,
+        translation_key=key,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: stats_fn(coordinator).summary()["p95"],
+        attributes_fn=lambda coordinator: stats_fn(coordinator).summary(),
+        context=METRICS_CONTEXT,
+        **kwargs,
+    )
 
 
 SENSORS: tuple[ZoneTouch3SensorDescription, ...] = (
@@ -34,37 +99,169 @@ SENSORS: tuple[ZoneTouch3SensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_display_precision=1,
-        value_fn=lambda state: state.system.temperature,
+        value_fn=lambda coordinator: coordinator.data.system.temperature,
+    ),
+    _temperature_statistic("temperature_min", lambda window: window.minimum),
+    _temperature_statistic("temperature_max", lambda window: window.maximum),
+    _temperature_statistic("temperature_mean", lambda window: window.mean),
+    ZoneTouch3SensorDescription(
+        key="temperature_rate",
+        translation_key="temperature_rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+        suggested_display_precision=2,
+        value_fn=lambda coordinator: coordinator.temperature_window.rate(),
+        attributes_fn=_temperature_window_attributes,
+        context=TEMPERATURE_CONTEXT,
     ),
     ZoneTouch3SensorDescription(
         key="system_id",
         translation_key="system_id",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda state: state.system.system_id or None,
+        value_fn=lambda coordinator: coordinator.data.system.system_id or None,
     ),
     ZoneTouch3SensorDescription(
         key="installer",
         translation_key="installer",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda state: state.system.installer or None,
+        value_fn=lambda coordinator: coordinator.data.system.installer or None,
     ),
     ZoneTouch3SensorDescription(
         key="installer_phone",
         translation_key="installer_phone",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda state: state.system.installer_phone or None,
+        value_fn=lambda coordinator: coordinator.data.system.installer_phone or None,
     ),
     ZoneTouch3SensorDescription(
         key="firmware_version",
         translation_key="firmware_version",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda state: state.system.firmware_version or None,
+        value_fn=lambda coordinator: coordinator.data.system.firmware_version or None,
     ),
     ZoneTouch3SensorDescription(
         key="console_version",
         translation_key="console_version",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda state: state.system.console_version or None,
+        value_fn=lambda coordinator: coordinator.data.system.console_version or None,
+    ),
+    _latency_sensor("poll_latency", lambda coordinator: coordinator.poll_latency),
+    ZoneTouch3SensorDescription(
+        key="poll_interval",
+        translation_key="poll_interval",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        context=METRICS_CONTEXT,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=0,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.poll_interval(),
+    ),
+    _latency_sensor(
+        "poll_lag",
+        lambda coordinator: coordinator.poll_lag,
+        entity_registry_enabled_default=False,
+    ),
+    _latency_sensor(
+        "round_trip_time",
+        lambda coordinator: coordinator.client.metrics.round_trip,
+        entity_registry_enabled_default=False,
+    ),
+    _latency_sensor(
+        "connect_time",
+        lambda coordinator: coordinator.client.metrics.connect_time,
+        entity_registry_enabled_default=False,
+    ),
+    _latency_sensor(
+        "command_wait",
+        lambda coordinator: coordinator.client.metrics.queue_wait[Priority.COMMAND],
+        entity_registry_enabled_default=False,
+    ),
+    _latency_sensor(
+        "poll_wait",
+        lambda coordinator: coordinator.client.metrics.queue_wait[Priority.POLL],
+        entity_registry_enabled_default=False,
+    ),
+    ZoneTouch3SensorDescription(
+        key="error_rate",
+        translation_key="error_rate",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        context=METRICS_CONTEXT,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: (
+            None
+            if (rate := coordinator.client.metrics.error_rate) is None
+            else rate * 100
+        ),
+        attributes_fn=lambda coordinator: {
+            "operations": coordinator.client.metrics.operations,
+            "failures": coordinator.client.metrics.failures,
+            "connects": coordinator.client.metrics.connects,
+            "connect_failures": coordinator.client.metrics.connect_failures,
+            "frames_skipped": coordinator.client.metrics.frames_skipped,
+            "stale_polls": coordinator.client.metrics.stale_polls,
+        },
+    ),
+    ZoneTouch3SensorDescription(
+        key="circuit_breaker",
+        translation_key="circuit_breaker",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        context=METRICS_CONTEXT,
+        device_class=SensorDeviceClass.ENUM,
+        options=[state.value for state in BreakerState],
+        value_fn=lambda coordinator: coordinator.client.breaker.state.value,
+        attributes_fn=lambda coordinator: {
+            "failures": coordinator.client.breaker.failures,
+            "retry_in": round(coordinator.client.breaker.retry_in),
+        },
+    ),
+    ZoneTouch3SensorDescription(
+        key="crc_errors",
+        translation_key="crc_errors",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        context=METRICS_CONTEXT,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.client.metrics.decoder.crc_mismatches,
+        attributes_fn=lambda coordinator: {
+            "frames": coordinator.client.metrics.decoder.frames,
+            "crc_with_stuffing": coordinator.client.metrics.decoder.crc_with_stuffing,
+            "crc_without_stuffing": (
+                coordinator.client.metrics.decoder.crc_without_stuffing
+            ),
+            "resyncs": coordinator.client.metrics.decoder.resyncs,
+            "bytes_skipped": coordinator.client.metrics.decoder.bytes_skipped,
+            "requeries": coordinator.client.metrics.requeries,
+        },
+    ),
+    ZoneTouch3SensorDescription(
+        key="data_received",
+        translation_key="data_received",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        context=METRICS_CONTEXT,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.client.metrics.decoder.bytes_in,
+    ),
+    ZoneTouch3SensorDescription(
+        key="data_sent",
+        translation_key="data_sent",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        context=METRICS_CONTEXT,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.client.metrics.bytes_out,
+        # Shared by all consoles.
+        attributes_fn=lambda coordinator: {
+            f"control_frame_cache_{name}": value
+            for name, value in control_frame_cache_stats().items()
+        },
     ),
 )
 
@@ -91,10 +288,16 @@ class ZoneTouch3Sensor(ZoneTouch3Entity, SensorEntity):
         coordinator: ZoneTouch3Coordinator,
         description: ZoneTouch3SensorDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, description.context)
         self.entity_description = description
         self._attr_unique_id = f"{self._device_id}_{description.key}"
 
     @property
     def native_value(self) -> float | str | None:
-        return self.entity_description.value_fn(self.coordinator.data)
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if (attributes_fn := self.entity_description.attributes_fn) is None:
+            return None
+        return attributes_fn(self.coordinator)
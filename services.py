@@ -0,0 +1,142 @@
+"""Services for the Polyaire ZoneTouch 3 integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+
+import voluptuous as vol
+
+from homeassistant.components.fan import DOMAIN as FAN_DOMAIN
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.service import async_extract_entity_ids
+
+from .const import DOMAIN
+from .coordinator import ZoneTouch3Coordinator
+from .zonetouch3 import PowerCommand, ZoneCommand
+
+SERVICE_SET_ZONES = "set_zones"
+SERVICE_REFRESH = "refresh"
+
+ATTR_POWER = "power"
+ATTR_PERCENTAGE = "percentage"
+ATTR_ZONES = "zones"
+
+POWER_COMMANDS = {
+    "on": PowerCommand.ON,
+    "off": PowerCommand.OFF,
+    "turbo": PowerCommand.TURBO,
+}
+
+ZONE_SETTINGS = {
+    vol.Optional(ATTR_POWER): vol.In(POWER_COMMANDS),
+    vol.Optional(ATTR_PERCENTAGE): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+}
+
+# One entry of the zones list: a zone and its own settings.
+ZONE_SCHEMA = vol.All(
+    vol.Schema({vol.Required(ATTR_ENTITY_ID): cv.entity_id, **ZONE_SETTINGS}),
+    cv.has_at_least_one_key(ATTR_POWER, ATTR_PERCENTAGE),
+)
+
+SET_ZONES_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            **ZONE_SETTINGS,
+            vol.Optional(ATTR_ZONES): vol.All(cv.ensure_list, [ZONE_SCHEMA]),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_POWER, ATTR_PERCENTAGE, ATTR_ZONES),
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the ZoneTouch 3 services."""
+
+    async def async_set_zones(call: ServiceCall) -> None:
+        """Control all targeted zones, with one message per console.
+
+        Targeted zones get the power and percentage given at the top level;
+        entries in zones give a zone its own settings, overriding those.
+        """
+        batches: defaultdict[ZoneTouch3Coordinator, dict[int, ZoneCommand]] = (
+            defaultdict(dict)
+        )
+        registry = er.async_get(hass)
+        if targets := await async_extract_entity_ids(hass, call):
+            if ATTR_POWER not in call.data and ATTR_PERCENTAGE not in call.data:
+                raise ServiceValidationError(
+                    "Targeted zones need a power state or a percentage"
+                )
+            command = _zone_command(
+                call.data.get(ATTR_POWER), call.data.get(ATTR_PERCENTAGE)
+            )
+            for entity_id in targets:
+                if (zone := _zone_of(hass, registry, entity_id)) is not None:
+                    batches[zone[0]][zone[1]] = command
+        for settings in call.data.get(ATTR_ZONES, ()):
+            entity_id = settings[ATTR_ENTITY_ID]
+            if (zone := _zone_of(hass, registry, entity_id)) is None:
+                raise ServiceValidationError(f"{entity_id} is not a ZoneTouch 3 zone")
+            batches[zone[0]][zone[1]] = _zone_command(
+                settings.get(ATTR_POWER), settings.get(ATTR_PERCENTAGE)
+            )
+
+        if not batches:
+            raise ServiceValidationError("No ZoneTouch 3 zones were targeted")
+        await asyncio.gather(
+            *(
+                coordinator.async_set_zones(commands)
+                for coordinator, commands in batches.items()
+            )
+        )
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Re-read zone names and system information from every console."""
+        await asyncio.gather(
+            *(
+                entry.runtime_data.async_request_full_refresh()
+                for entry in hass.config_entries.async_entries(DOMAIN)
+                if entry.state is ConfigEntryState.LOADED
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_ZONES, async_set_zones, schema=SET_ZONES_SCHEMA
+    )
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, async_refresh)
+
+
+def _zone_of(
+    hass: HomeAssistant, registry: er.EntityRegistry, entity_id: str
+) -> tuple[ZoneTouch3Coordinator, int] | None:
+    """The coordinator and zone number of a zone fan; None for other entities."""
+    entity = registry.async_get(entity_id)
+    if (
+        entity is None
+        or entity.platform != DOMAIN
+        or entity.domain != FAN_DOMAIN
+        or entity.config_entry_id is None
+    ):
+        return None
+    entry = hass.config_entries.async_get_entry(entity.config_entry_id)
+    if entry is None or entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"The console for {entity_id} is not loaded")
+    return entry.runtime_data, int(entity.unique_id.rsplit("_zone_", 1)[1])
+
+
+def _zone_command(power: str | None, percentage: int | None) -> ZoneCommand:
+    """Translate service data to a zone command, matching the fan entities.
+
+    A percentage of 0 closes the zone, and setting a percentage without a
+    power state opens it.
+    """
+    if percentage == 0:
+        return PowerCommand.OFF, None
+    if power is None:
+        return PowerCommand.ON, percentage
+    return POWER_COMMANDS[power], percentage
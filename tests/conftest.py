@@ -0,0 +1,8 @@
+"""Test setup: the protocol modules are imported on their own, without HA."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,67 @@
+"""Tests for capture.CaptureWriter and read_capture."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from capture import CaptureWriter, read_capture
+import zonetouch3 as zt
+
+
+def _write(path: Path, *chunks: bytes) -> None:
+    writer = CaptureWriter(str(path))
+    for chunk in chunks:
+        writer.write(zt.Direction.RECEIVED, chunk)
+    writer.close()
+
+
+def test_records_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "capture.zt3cap"
+    _write(path, b"\x55\x55\x55\xaa", b"")
+    _write(path, b"more")
+    records = list(read_capture(str(path)))
+    assert [record.data for record in records] == [b"\x55\x55\x55\xaa", b"", b"more"]
+    assert {record.direction for record in records} == {zt.Direction.RECEIVED}
+
+
+@pytest.mark.parametrize(
+    "tail",
+    [
+        b"\x10",  # part of a record header
+        b"\x10\x00\x00\x00" + bytes(8) + b"\x01abc",  # data cut short
+        b"\x00\x00\x00\x00" + bytes(8) + b"\x07",  # not a direction
+    ],
+)
+def test_appending_after_a_cut_short_record(tmp_path: Path, tail: bytes) -> None:
+    """A record left incomplete by a crash does not swallow later ones."""
+    path = tmp_path / "capture.zt3cap"
+    _write(path, b"one", b"two")
+    with path.open("ab") as file:
+        file.write(tail)
+    _write(path, *(bytes((index,)) * 5 for index in range(4)))
+    records = list(read_capture(str(path)))
+    assert [record.data for record in records] == [
+        b"one",
+        b"two",
+        *(bytes((index,)) * 5 for index in range(4)),
+    ]
+
+
+def test_writing_stops_at_max_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "capture.zt3cap"
+    writer = CaptureWriter(str(path), max_bytes=100)
+    for _ in range(10):
+        writer.write(zt.Direction.SENT, bytes(20))
+    writer.close()
+    assert path.stat().st_size <= 100
+    assert len(list(read_capture(str(path)))) == 2
+
+
+def test_refuses_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"not a capture")
+    with pytest.raises(ValueError):
+        CaptureWriter(str(path))
+    assert path.read_bytes() == b"not a capture"
@@ -0,0 +1,138 @@
+"""Tests for ZoneTouch3Client against the emulator over loopback."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from emulator import ZoneTouch3Emulator
+import zonetouch3 as zt
+
+BASE_DELAY = 0.1
+
+
+async def _free_port() -> int:
+    emulator = ZoneTouch3Emulator(2)
+    await emulator.async_start()
+    port = emulator.port
+    await emulator.async_stop()
+    return port
+
+
+def _client(port: int, timeout: float = 0.5) -> zt.ZoneTouch3Client:
+    client = zt.ZoneTouch3Client("127.0.0.1", port, timeout=timeout)
+    client.breaker = zt.CircuitBreaker(
+        threshold=2, base_delay=BASE_DELAY, max_delay=10 * BASE_DELAY
+    )
+    return client
+
+
+def test_breaker_fails_fast_and_recovers() -> None:
+    """Short-lived connections: open at the threshold, probe, then close."""
+
+    async def run() -> None:
+        port = await _free_port()
+        client = _client(port)
+        for _ in range(2):
+            with pytest.raises(zt.ZoneTouch3ConnectionError) as raised:
+                await client.async_get_zones()
+            assert not isinstance(raised.value, zt.ZoneTouch3CircuitOpenError)
+        assert client.breaker.state is zt.BreakerState.OPEN
+        with pytest.raises(zt.ZoneTouch3CircuitOpenError):
+            await client.async_get_zones()
+
+        # The probe after the backoff fails: the backoff doubles.
+        await asyncio.sleep(client.breaker.retry_in)
+        with pytest.raises(zt.ZoneTouch3ConnectionError):
+            await client.async_get_zones()
+        assert client.breaker.state is zt.BreakerState.OPEN
+        assert client.breaker.retry_in > 1.2 * BASE_DELAY
+
+        emulator = ZoneTouch3Emulator(2, port=port)
+        await emulator.async_start()
+        try:
+            await asyncio.sleep(client.breaker.retry_in)
+            assert len(await client.async_get_zones()) == 2
+            assert client.breaker.state is zt.BreakerState.CLOSED
+            assert client.breaker.failures == 0
+        finally:
+            await emulator.async_stop()
+
+    asyncio.run(run())
+
+
+def test_probe_needs_an_answer() -> None:
+    """A device that accepts connections but does not answer is a failure."""
+
+    async def run() -> None:
+        async def silent(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            await reader.read()
+            writer.close()
+
+        server = await asyncio.start_server(silent, "127.0.0.1", 0)
+        client = _client(server.sockets[0].getsockname()[1], timeout=0.1)
+        try:
+            for _ in range(2):
+                with pytest.raises(zt.ZoneTouch3ConnectionError):
+                    await client.async_get_zones()
+            await asyncio.sleep(client.breaker.retry_in)
+            with pytest.raises(zt.ZoneTouch3ConnectionError):
+                await client.async_get_zones()  # the probe times out
+            assert client.breaker.state is zt.BreakerState.OPEN
+            assert client.breaker.failures == 3
+        finally:
+            server.close()
+
+    asyncio.run(run())
+
+
+def test_persistent_connection_fails_fast_then_reconnects() -> None:
+    async def run() -> None:
+        port = await _free_port()
+        client = _client(port)
+        await client.async_start()
+        try:
+            while client.breaker.state is not zt.BreakerState.OPEN:
+                await asyncio.sleep(0.01)
+            with pytest.raises(zt.ZoneTouch3CircuitOpenError):
+                await client.async_get_zones()
+
+            emulator = ZoneTouch3Emulator(3, port=port)
+            await emulator.async_start()
+            try:
+                async with asyncio.timeout(20 * BASE_DELAY):
+                    while not client.connected:
+                        await asyncio.sleep(0.01)
+                assert client.breaker.state is zt.BreakerState.CLOSED
+                assert len(await client.async_get_zones()) == 3
+            finally:
+                await emulator.async_stop()
+        finally:
+            await client.async_stop()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_unreadable_reply_counts_as_failure(persistent: bool) -> None:
+    async def run() -> None:
+        emulator = ZoneTouch3Emulator(2)
+        emulator.zones[1].number = 0  # two groups numbered 0: not a valid status
+        await emulator.async_start()
+        client = _client(emulator.port)
+        try:
+            if persistent:
+                await client.async_start()
+            for fetch in (client.async_get_zones, client.async_get_state):
+                with pytest.raises(zt.ZoneTouch3ProtocolError):
+                    await fetch()
+            assert client.metrics.failures == 2
+            assert client.metrics.error_rate == 1.0
+        finally:
+            await client.async_stop()
+            await emulator.async_stop()
+
+    asyncio.run(run())
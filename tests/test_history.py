@@ -0,0 +1,53 @@
+"""Tests for history.SampleHistory."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from history import SampleHistory
+
+
+def test_empty_window() -> None:
+    window = SampleHistory(4, (60,)).window(60)
+    assert len(window) == 0
+    assert window.minimum is window.maximum is window.mean is None
+    assert window.rate() is None
+
+
+def test_window_expires_old_samples() -> None:
+    history = SampleHistory(16, (60,))
+    for timestamp, value in ((0, 20.0), (30, 25.0), (61, 22.0)):
+        history.add(timestamp, value)
+    window = history.window(60)
+    assert len(window) == 2  # the sample at 0 is more than 60 s old
+    assert (window.minimum, window.maximum) == (22.0, 25.0)
+    assert window.mean == pytest.approx(23.5)
+    assert window.rate(per=1) == pytest.approx(-3 / 31)
+
+
+@pytest.mark.parametrize("capacity", [2, 3, 7, 50])
+def test_matches_brute_force(capacity: int) -> None:
+    """Statistics equal those computed from the samples still held."""
+    rng = random.Random(capacity)
+    history = SampleHistory(capacity, (10, 35))
+    samples: list[tuple[float, float]] = []
+    timestamp = 0.0
+    for _ in range(500):
+        timestamp += rng.choice((0, 1, 2, 5, 7))
+        value = rng.uniform(-5, 40)
+        history.add(timestamp, value)
+        samples.append((timestamp, value))
+        for seconds in (10, 35):
+            held = [
+                sample
+                for sample in samples[-capacity:]
+                if sample[0] >= timestamp - seconds
+            ]
+            values = [value for _, value in held]
+            window = history.window(seconds)
+            assert len(window) == len(held)
+            assert window.minimum == min(values)
+            assert window.maximum == max(values)
+            assert window.mean == pytest.approx(sum(values) / len(values))
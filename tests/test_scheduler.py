@@ -0,0 +1,118 @@
+"""Tests for scheduler.PollScheduler and AdaptiveInterval."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import scheduler
+from zonetouch3 import LatencyStats
+
+
+@pytest.mark.parametrize(
+    ("phase", "last", "now", "due"),
+    [
+        (0.0, 100.0, 100.0, 110.0),  # at least half an interval after
+        (0.5, 100.0, 100.0, 105.0),
+        (0.25, 100.0, 100.0, 112.5),
+        (0.25, 100.0, 130.0, 132.5),  # overdue: the next slot of its phase
+        (0.5, 100.0, 125.0, 125.0),  # exactly on its slot
+    ],
+)
+def test_next_due_follows_phase(
+    phase: float, last: float, now: float, due: float
+) -> None:
+    async def run() -> float:
+        job = scheduler.PollJob(
+            scheduler.PollScheduler(), asyncio.sleep, lambda: 10.0, LatencyStats()
+        )
+        job.phase = phase
+        job._last = last
+        return job._next_due(now)
+
+    assert asyncio.run(run()) == pytest.approx(due)
+
+
+def test_jobs_are_spread_over_the_interval() -> None:
+    async def run() -> None:
+        polls = scheduler.PollScheduler()
+        jobs = [polls.add(asyncio.sleep, lambda: 60.0) for _ in range(4)]
+        assert [job.phase for job in jobs] == [0, 0.25, 0.5, 0.75]
+        jobs[1].cancel()
+        assert [job.phase for job in jobs if job is not jobs[1]] == [0, 1 / 3, 2 / 3]
+        for job in jobs:
+            job.cancel()
+
+    asyncio.run(run())
+
+
+def test_polls_stay_within_the_concurrency_budget() -> None:
+    async def run() -> None:
+        polls = scheduler.PollScheduler(max_concurrent=2)
+        running = peak = done = 0
+
+        async def poll() -> None:
+            nonlocal running, peak, done
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.03)
+            running -= 1
+            done += 1
+
+        jobs = [polls.add(poll, lambda: 0.02) for _ in range(5)]
+        await asyncio.sleep(0.3)
+        for job in jobs:
+            job.cancel()
+        assert peak == 2
+        assert done >= 5
+
+    asyncio.run(run())
+
+
+class _Clock:
+    """Stands in for time.monotonic; random jitter is pinned to none."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.now = 1000.0
+        monkeypatch.setattr(scheduler.time, "monotonic", lambda: self.now)
+        monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: 1.0)
+
+
+def test_interval_is_fast_after_activity(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = _Clock(monkeypatch)
+    interval = scheduler.AdaptiveInterval(30, 5, 600)
+    assert interval() == 30
+    interval.activity()
+    assert interval() == 5
+    clock.now += scheduler.FAST_WINDOW
+    interval.record_poll(True, 0.1)
+    assert interval() == 30
+    interval.set_base(30, fast_polling=False)
+    interval.activity()
+    assert interval() == 30
+
+
+def test_interval_backs_off_when_idle(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = _Clock(monkeypatch)
+    interval = scheduler.AdaptiveInterval(30, 5, 600)
+    intervals = []
+    for _ in range(4):
+        clock.now += scheduler.IDLE_AFTER
+        interval.record_poll(True, 0.1)
+        intervals.append(interval())
+    assert intervals == [60, 120, 120, 120]
+
+
+def test_interval_backs_off_on_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    _Clock(monkeypatch)
+    interval = scheduler.AdaptiveInterval(30, 5, 200)
+    intervals = []
+    for _ in range(3):
+        interval.record_poll(False, 0.1)
+        intervals.append(interval())
+    assert intervals == [60, 120, 200]  # kept within the maximum
+    interval.record_poll(True, scheduler.SLOW_POLL + 1)
+    assert interval() == 60
+    interval.record_poll(True, 0.1)
+    assert interval() == 30
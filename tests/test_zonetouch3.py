@@ -0,0 +1,370 @@
+"""Tests for the sans-IO parts of zonetouch3.py."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from emulator import ZoneTouch3Emulator
+import zonetouch3 as zt
+
+# Ends in a run of three 0x55 bytes, so a stuffed byte follows the last
+# data byte, just before the CRC.
+STUFFED_TAIL = bytes((zt.SUBTYPE_GROUP_STATUS, 0x00, 0x55, 0x55, 0x55))
+
+
+def _frame(data: bytes, *, crc_includes_stuffing: bool = True) -> bytes:
+    """A frame with a CRC over the body as sent, or before stuffing."""
+    if crc_includes_stuffing:
+        return zt.build_message(zt.ADDRESS_CONTROL, zt.TYPE_CONTROL, data)
+    body = (
+        zt.ADDRESS_CONTROL
+        + bytes((zt.MESSAGE_ID, zt.TYPE_CONTROL))
+        + len(data).to_bytes(2, "big")
+        + data
+    )
+    return zt.HEADER + zt._stuff(body) + zt._crc16(body)
+
+
+def _group_status(zone_count: int, percentage: int) -> zt.Frame:
+    """A group status frame for zones 0 to zone_count - 1, all at percentage."""
+    emulator = ZoneTouch3Emulator(zone_count)
+    for zone in emulator.zones.values():
+        zone.percentage = percentage
+    return zt.FrameDecoder().feed(emulator.group_status_frame())[0]
+
+
+def _decode(*chunks: bytes) -> tuple[zt.FrameDecoder, list[bytes]]:
+    decoder = zt.FrameDecoder()
+    frames = [frame.data for chunk in chunks for frame in decoder.feed(chunk)]
+    return decoder, frames
+
+
+@pytest.mark.parametrize("split", range(1, len(zt.HEADER)))
+def test_header_split_across_chunks(split: int) -> None:
+    """A frame is found when its header arrives in two chunks."""
+    frame = _frame(b"\x21\x00")
+    cut = len(b"junk") + split
+    decoder, frames = _decode((b"junk" + frame)[:cut], (b"junk" + frame)[cut:])
+    assert frames == [b"\x21\x00"]
+    assert decoder.stats.bytes_skipped == len(b"junk")
+
+
+def test_every_chunking_decodes_the_same() -> None:
+    """Splitting the stream at any point does not change the frames."""
+    stream = _frame(STUFFED_TAIL) + _frame(b"\x55\x55\x55\x55\x01")
+    for cut in range(1, len(stream)):
+        _, frames = _decode(stream[:cut], stream[cut:])
+        assert frames == [STUFFED_TAIL, b"\x55\x55\x55\x55\x01"], cut
+
+
+@pytest.mark.parametrize("crc_includes_stuffing", [True, False])
+def test_stuffed_byte_after_last_data_byte(crc_includes_stuffing: bool) -> None:
+    """The 0x00 stuffed after the data is dropped, with either CRC variant."""
+    frame = _frame(STUFFED_TAIL, crc_includes_stuffing=crc_includes_stuffing)
+    assert frame[-3] == 0x00  # the stuffed byte, just before the CRC
+    decoder, frames = _decode(frame)
+    assert frames == [STUFFED_TAIL]
+    assert decoder.stats.crc_mismatches == 0
+    if crc_includes_stuffing:
+        assert decoder.stats.crc_with_stuffing == 1
+    else:
+        assert decoder.stats.crc_without_stuffing == 1
+
+
+def test_crc_variants_agree_without_stuffing() -> None:
+    """Without stuffed bytes both CRC variants are the same frame."""
+    frame = _frame(b"\x21\x01\x02")
+    assert frame == _frame(b"\x21\x01\x02", crc_includes_stuffing=False)
+    decoder, frames = _decode(frame)
+    assert frames == [b"\x21\x01\x02"]
+    assert decoder.stats.crc_with_stuffing == decoder.stats.crc_without_stuffing == 0
+
+
+def test_resync_after_bad_crc() -> None:
+    """A frame with a bad CRC is dropped and the next one still decoded."""
+    bad = bytearray(_frame(b"\x21\x01"))
+    bad[-1] ^= 0xFF
+    decoder, frames = _decode(bytes(bad) + _frame(b"\x21\x02"))
+    assert frames == [b"\x21\x02"]
+    assert decoder.stats.crc_mismatches == 1
+    assert decoder.resyncs == 1
+
+
+def test_resync_on_header_inside_frame() -> None:
+    """A frame cut short by the next header loses only itself."""
+    truncated = _frame(b"\x21" + bytes(20))[:12]
+    decoder, frames = _decode(truncated, _frame(b"\x21\x02"), _frame(b"\x21\x03"))
+    assert frames == [b"\x21\x02", b"\x21\x03"]
+    assert decoder.resyncs == 1
+
+
+def test_resync_on_implausible_length() -> None:
+    """A corrupted length field does not swallow the following frames."""
+    bad = bytearray(_frame(b"\x21\x01"))
+    bad[8:10] = b"\xff\xff"
+    decoder, frames = _decode(bytes(bad) + _frame(b"\x21\x02"))
+    assert frames == [b"\x21\x02"]
+    assert decoder.resyncs == 1
+
+
+def test_garbage_between_frames_counts_one_resync() -> None:
+    """A run of skipped bytes is one resync, however it is chunked."""
+    decoder, frames = _decode(
+        _frame(b"\x21\x01"), b"\x00\x01", b"\x02\x03", _frame(b"\x21\x02")
+    )
+    assert frames == [b"\x21\x01", b"\x21\x02"]
+    assert decoder.resyncs == 1
+    assert decoder.stats.bytes_skipped == 4
+
+
+def test_priority_lock_serves_commands_first() -> None:
+    """Waiting commands go before waiting polls; cancelled waiters are skipped."""
+
+    async def run() -> list[str]:
+        lock = zt._PriorityLock()
+        order: list[str] = []
+
+        async def take(priority: zt.Priority, name: str) -> None:
+            await lock.acquire(priority)
+            order.append(name)
+            lock.release()
+
+        await lock.acquire(zt.Priority.POLL)
+        tasks = [
+            asyncio.create_task(take(zt.Priority.POLL, "poll 1")),
+            asyncio.create_task(take(zt.Priority.POLL, "poll 2")),
+            asyncio.create_task(take(zt.Priority.COMMAND, "command")),
+        ]
+        cancelled = asyncio.create_task(take(zt.Priority.COMMAND, "cancelled"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        lock.release()
+        await asyncio.gather(*tasks)
+        assert not lock._locked
+        return order
+
+    assert asyncio.run(run()) == ["command", "poll 1", "poll 2"]
+
+
+def test_pushed_status_is_merged_into_the_last_complete_status() -> None:
+    """A push may list only some zones; polls must not take it for all."""
+    client = zt.ZoneTouch3Client("192.0.2.1")
+    pushed = _group_status(2, 30)
+    client._dispatch(pushed.msg_type, pushed.data)
+    assert client._status_since(0.0) is None
+
+    polled = _group_status(4, 100)
+    client._note_status(zt._parse_group_status(polled.data), complete=True)
+    client._dispatch(pushed.msg_type, pushed.data)
+    zones = client._status_since(0.0)
+    assert zones is not None
+    assert {number: zone.percentage for number, zone in zones.items()} == {
+        0: 30,
+        1: 30,
+        2: 100,
+        3: 100,
+    }
+
+
+def test_partial_push_does_not_answer_a_status_request() -> None:
+    """A push arriving while a poll waits is not taken as the poll's reply."""
+
+    async def run() -> None:
+        client = zt.ZoneTouch3Client("192.0.2.1")
+        polled = _group_status(4, 100)
+        client._note_status(zt._parse_group_status(polled.data), complete=True)
+        pushes: list[dict[int, zt.ZoneStatus]] = []
+        client.add_status_listener(pushes.append)
+        pending = zt._PendingRequest(
+            zt._STATUS_REQUEST,
+            zt._is_group_status,
+            asyncio.get_running_loop().create_future(),
+        )
+        client._pending = [pending]
+
+        pushed = _group_status(2, 30)
+        client._dispatch(pushed.msg_type, pushed.data)
+        assert not pending.future.done()
+        assert [list(zones) for zones in pushes] == [[0, 1]]
+
+        reply = _group_status(4, 30)
+        client._dispatch(reply.msg_type, reply.data)
+        assert pending.future.result() == reply.data
+
+    asyncio.run(run())
+
+
+class _Clock:
+    """Stands in for time.monotonic; random jitter is pinned to none."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.now = 1000.0
+        monkeypatch.setattr(zt.time, "monotonic", lambda: self.now)
+        monkeypatch.setattr(zt.random, "uniform", lambda low, high: 1.0)
+
+
+def test_breaker_opens_at_threshold(monkeypatch: pytest.MonkeyPatch) -> None:
+    _Clock(monkeypatch)
+    breaker = zt.CircuitBreaker(threshold=3, base_delay=5, max_delay=60)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state is zt.BreakerState.CLOSED
+        assert breaker.check() is False
+    breaker.record_failure()
+    assert breaker.state is zt.BreakerState.OPEN
+    assert breaker.retry_in == 5
+    with pytest.raises(zt.ZoneTouch3CircuitOpenError):
+        breaker.check()
+
+
+def test_breaker_backoff_doubles_on_failed_probes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clock = _Clock(monkeypatch)
+    breaker = zt.CircuitBreaker(threshold=2, base_delay=5, max_delay=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    delays = []
+    for _ in range(4):
+        delays.append(breaker.retry_in)
+        clock.now += breaker.retry_in
+        assert breaker.check() is True  # the probe
+        assert breaker.state is zt.BreakerState.HALF_OPEN
+        with pytest.raises(zt.ZoneTouch3CircuitOpenError):
+            breaker.check()  # only one probe at a time
+        breaker.record_failure()
+        assert breaker.state is zt.BreakerState.OPEN
+    assert delays == [5, 10, 20, 30]
+
+
+def test_breaker_closes_after_successful_probe(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clock = _Clock(monkeypatch)
+    breaker = zt.CircuitBreaker(threshold=1, base_delay=5, max_delay=30)
+    breaker.record_failure()
+    clock.now += 5
+    assert breaker.check() is True
+    breaker.record_success()
+    assert breaker.state is zt.BreakerState.CLOSED
+    assert breaker.failures == 0
+    assert breaker.check() is False
+    breaker.record_failure()  # counting starts again from the threshold
+    assert breaker.retry_in == 5
+
+
+class _RecordingClient:
+    """Stands in for ZoneTouch3Client, recording the messages sent."""
+
+    def __init__(self) -> None:
+        self.sent: list[dict[int, zt.ZoneCommand]] = []
+
+    async def async_set_zones(
+        self, commands: dict[int, zt.ZoneCommand]
+    ) -> dict[int, zt.ZoneStatus]:
+        self.sent.append(commands)
+        return {}
+
+
+def test_command_queue_merges_waiting_commands() -> None:
+    async def run() -> None:
+        client = _RecordingClient()
+        queue = zt.ZoneCommandQueue(client, min_interval=60)  # type: ignore[arg-type]
+        await asyncio.gather(
+            queue.async_set_zone(1, zt.PowerCommand.ON),
+            queue.async_set_zone(1, percentage=40),
+            queue.async_set_zone(2, zt.PowerCommand.OFF),
+        )
+        assert client.sent == [
+            {1: (zt.PowerCommand.ON, 40), 2: (zt.PowerCommand.OFF, None)}
+        ]
+
+    asyncio.run(run())
+
+
+def test_command_queue_cancel_sends_nothing_more() -> None:
+    async def run() -> None:
+        client = _RecordingClient()
+        queue = zt.ZoneCommandQueue(client, min_interval=60)  # type: ignore[arg-type]
+        await queue.async_set_zone(1, percentage=50)
+        waiting = asyncio.create_task(queue.async_set_zone(1, percentage=60))
+        await asyncio.sleep(0)  # now waiting out min_interval
+        queue.cancel()
+        with pytest.raises(zt.ZoneTouch3Error):
+            await waiting
+        with pytest.raises(zt.ZoneTouch3Error):
+            await queue.async_set_zone(2, percentage=70)
+        await asyncio.sleep(0)
+        assert client.sent == [{1: (zt.PowerCommand.KEEP, 50)}]
+
+    asyncio.run(run())
+
+
+def _zone(number: int, percentage: int = 50, name: str = "") -> zt.ZoneStatus:
+    return zt.ZoneStatus(number, zt.PowerState.ON, percentage, False, False, name)
+
+
+def test_with_status_shares_unchanged_zones() -> None:
+    state = zt.ZoneTouchState(zones={0: _zone(0, name="Living"), 1: _zone(1)})
+    assert state.with_status({0: _zone(0), 1: _zone(1)}) is state
+
+    changed = state.with_status({0: _zone(0, 80), 1: _zone(1)})
+    assert changed.zones[0].percentage == 80
+    assert changed.zones[0].name == "Living"  # names are carried over
+    assert changed.zones[1] is state.zones[1]
+    assert changed.system is state.system
+    assert zt.diff_zones(state.zones, changed.zones) == {0: frozenset({"percentage"})}
+
+
+def test_with_status_merge_keeps_missing_zones() -> None:
+    state = zt.ZoneTouchState(zones={0: _zone(0), 1: _zone(1)})
+    assert list(state.with_status({0: _zone(0, 80)}).zones) == [0]
+    merged = state.with_status({0: _zone(0, 80)}, merge=True)
+    assert list(merged.zones) == [0, 1]
+    assert merged.zones[1] is state.zones[1]
+
+
+def test_reuse_unchanged() -> None:
+    state = zt.ZoneTouchState(
+        system=zt.SystemInfo(system_id="1"), zones={0: _zone(0), 1: _zone(1)}
+    )
+    fetched = zt.ZoneTouchState(
+        system=zt.SystemInfo(system_id="1"), zones={0: _zone(0), 1: _zone(1, 80)}
+    )
+    reused = state.reuse_unchanged(fetched)
+    assert reused.system is state.system
+    assert reused.zones[0] is state.zones[0]
+    assert reused.zones[1] is fetched.zones[1]
+    equal = zt.ZoneTouchState(zt.SystemInfo(system_id="1"), dict(state.zones))
+    assert state.reuse_unchanged(equal) is state
+
+
+def test_state_round_trips_through_json() -> None:
+    state = zt.ZoneTouchState(
+        system=zt.SystemInfo(system_id="24000001", temperature=22.5),
+        zones={
+            0: _zone(0, name="Living"),
+            3: zt.ZoneStatus(3, zt.PowerState.TURBO, 100, True, True, "Bed"),
+        },
+    )
+    restored = zt.ZoneTouchState.from_dict(json.loads(json.dumps(state.as_dict())))
+    assert restored == state
+    assert restored.zones[3].power is zt.PowerState.TURBO
+
+
+@pytest.mark.parametrize(
+    ("data", "error"),
+    [
+        ({"zones": []}, KeyError),
+        ({"system": {}, "zones": [{"number": 0, "power": 9}]}, ValueError),
+        ({"system": {"colour": "red"}, "zones": []}, TypeError),
+    ],
+)
+def test_state_from_bad_data(data: dict[str, Any], error: type[Exception]) -> None:
+    with pytest.raises(error):
+        zt.ZoneTouchState.from_dict(data)
@@ -18,15 +18,30 @@ Implements the "ZoneTouch 3 Communication Protocol V1.0":
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass, field
-from enum import IntEnum
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager, suppress
+from dataclasses import asdict, dataclass, field, fields, replace
+from enum import IntEnum, StrEnum
+from functools import lru_cache, partial
+import heapq
+import itertools
 import logging
-from typing import Callable
+import random
+import socket
+import struct
+import sys
+import time
+from typing import Any, Awaitable, Callable, NamedTuple, cast
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_PORT = 7030
 DEFAULT_TIMEOUT = 5.0
+RECONNECT_DELAY = 5.0
+MAX_RECONNECT_DELAY = 300.0
+BREAKER_THRESHOLD = 3  # consecutive connection failures before failing fast
+DEFAULT_COMMAND_INTERVAL = 0.5
 
 HEADER = b"\x55\x55\x55\xaa"
 ADDRESS_CONTROL = b"\x80\xb0"
@@ -56,7 +71,8 @@ _INFO_FIRMWARE_VERSION = (69, 7)
 _INFO_CONSOLE_VERSION = (85, 7)
 
 _MAX_DATA_LENGTH = 4096
-_MAX_HEADER_SEARCH = 256
+_READ_SIZE = 4096
+_STUFF_RUN = b"\x55\x55\x55"
 _MAX_FRAME_SKIP = 8
 
 
@@ -68,6 +84,10 @@ class ZoneTouch3ConnectionError(ZoneTouch3Error):
     """Could not connect to or exchange data with the device."""
 
 
+class ZoneTouch3CircuitOpenError(ZoneTouch3ConnectionError):
+    """The console has been unreachable; not trying again until a backoff ends."""
+
+
 class ZoneTouch3ProtocolError(ZoneTouch3Error):
     """The device sent data that could not be understood."""
 
@@ -82,6 +102,10 @@ class PowerCommand(IntEnum):
     TURBO = 0b101
 
 
+# What to do with one zone: power command and open percentage (None keeps it).
+ZoneCommand = tuple[PowerCommand, int | None]
+
+
 class PowerState(IntEnum):
     """Power bits (byte 1, bits 8-7) of a group status message."""
 
@@ -90,7 +114,7 @@ class PowerState(IntEnum):
     TURBO = 0b11
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ZoneStatus:
     """State of a single zone (group) as reported by the device."""
 
@@ -105,8 +129,37 @@ class ZoneStatus:
     def is_on(self) -> bool:
         return self.power is not PowerState.OFF
 
+    def same_status(self, other: ZoneStatus) -> bool:
+        """Whether other reports the same status, ignoring the name."""
+        return (
+            self.power is other.power
+            and self.percentage == other.percentage
+            and self.turbo_supported == other.turbo_supported
+            and self.spill_active == other.spill_active
+        )
 
-@dataclass
+    def after_command(
+        self, power: PowerCommand, percentage: int | None = None
+    ) -> ZoneStatus:
+        """The status the device is expected to report after a command."""
+        if power is PowerCommand.NEXT:
+            new_power = PowerState.OFF if self.is_on else PowerState.ON
+        elif power is PowerCommand.OFF:
+            new_power = PowerState.OFF
+        elif power is PowerCommand.ON:
+            new_power = PowerState.ON
+        elif power is PowerCommand.TURBO and self.turbo_supported:
+            new_power = PowerState.TURBO
+        else:
+            new_power = self.power
+        return replace(
+            self,
+            power=new_power,
+            percentage=self.percentage if percentage is None else percentage,
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class SystemInfo:
     """Static system information and the console temperature."""
 
@@ -119,22 +172,135 @@ class SystemInfo:
     temperature: float | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ZoneTouchState:
-    """Complete state of a ZoneTouch 3 system."""
+    """Complete state of a ZoneTouch 3 system.
+
+    States are immutable snapshots: updates build a new state that reuses
+    every zone and the system information that did not change, so unchanged
+    parts can be compared by identity. The zones mapping must not be
+    modified once the state is created.
+    """
 
     system: SystemInfo = field(default_factory=SystemInfo)
-    zones: dict[int, ZoneStatus] = field(default_factory=dict)
+    zones: Mapping[int, ZoneStatus] = field(default_factory=dict)
 
+    def with_status(
+        self, zones: Mapping[int, ZoneStatus], *, merge: bool = False
+    ) -> ZoneTouchState:
+        """Return the state with a group status message applied.
 
-def _crc16(data: bytes) -> bytes:
-    """CRC16-MODBUS, transmitted high byte first."""
-    crc = 0xFFFF
-    for byte in data:
-        crc ^= byte
+        Group status has no names, so known names are carried over. With
+        merge, zones missing from the message are kept (a pushed update);
+        otherwise they are dropped. Returns self if nothing changed.
+        """
+        new_zones = dict(self.zones) if merge else {}
+        changed = not merge and zones.keys() != self.zones.keys()
+        for number, status in zones.items():
+            existing = self.zones.get(number)
+            if existing is None:
+                changed = True
+            elif existing.same_status(status):
+                status = existing
+            else:
+                status = replace(status, name=existing.name)
+                changed = True
+            new_zones[number] = status
+        if not changed:
+            return self
+        return ZoneTouchState(system=self.system, zones=new_zones)
+
+    def reuse_unchanged(self, state: ZoneTouchState) -> ZoneTouchState:
+        """Return state, sharing this state's objects wherever they are equal.
+
+        Returns self if state is equal to it.
+        """
+        system = self.system if state.system == self.system else state.system
+        zones = {
+            number: existing
+            if (existing := self.zones.get(number)) == status
+            else status
+            for number, status in state.zones.items()
+        }
+        if system is self.system and zones == self.zones:
+            return self
+        return ZoneTouchState(system=system, zones=zones)
+
+    def as_dict(self) -> dict[str, Any]:
+        """The state as JSON serialisable data, for from_dict."""
+        return {
+            "system": asdict(self.system),
+            "zones": [
+                {**asdict(zone), "power": int(zone.power)}
+                for zone in self.zones.values()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ZoneTouchState:
+        """Rebuild a state from as_dict data.
+
+        Raises KeyError, TypeError or ValueError if the data does not fit.
+        """
+        zones = {}
+        for zone in data["zones"]:
+            status = ZoneStatus(**{**zone, "power": PowerState(zone["power"])})
+            zones[status.number] = status
+        return cls(system=SystemInfo(**data["system"]), zones=zones)
+
+
+_ZONE_FIELDS = tuple(f.name for f in fields(ZoneStatus))
+
+
+def diff_zones(
+    old: Mapping[int, ZoneStatus], new: Mapping[int, ZoneStatus]
+) -> dict[int, frozenset[str]]:
+    """Return the names of the fields that differ, for each zone that changed.
+
+    A zone present in only one of the mappings is reported with all fields.
+    """
+    changes: dict[int, frozenset[str]] = {}
+    for number in old.keys() | new.keys():
+        before, after = old.get(number), new.get(number)
+        if before is after:
+            continue
+        if before is None or after is None:
+            changes[number] = frozenset(_ZONE_FIELDS)
+        elif changed := frozenset(
+            name
+            for name in _ZONE_FIELDS
+            if getattr(before, name) != getattr(after, name)
+        ):
+            changes[number] = changed
+    return changes
+
+
+def _crc16_table() -> tuple[int, ...]:
+    """CRC16-MODBUS of every single byte, for byte-at-a-time updates."""
+    table = []
+    for byte in range(256):
+        crc = byte
         for _ in range(8):
             crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
-    return crc.to_bytes(2, "big")
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _crc16_table()
+_CRC16_INIT = 0xFFFF
+
+
+def _crc16_update(crc: int, data: bytes | bytearray) -> int:
+    """Continue a CRC16-MODBUS computation over more data."""
+    table = _CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def _crc16(data: bytes) -> bytes:
+    """CRC16-MODBUS, transmitted high byte first."""
+    return _crc16_update(_CRC16_INIT, data).to_bytes(2, "big")
 
 
 def _stuff(data: bytes) -> bytes:
@@ -155,29 +321,48 @@ def build_message(address: bytes, msg_type: int, data: bytes) -> bytes:
     body = _stuff(
         address + bytes((MESSAGE_ID, msg_type)) + len(data).to_bytes(2, "big") + data
     )
-    return HEADER + body + _crc16(body)
+    crc = _crc16_update(_CRC16_INIT, body)
+    return HEADER + body + crc.to_bytes(2, "big")
+
 
+def _group_control_data(commands: Mapping[int, ZoneCommand]) -> bytes:
+    """Build the data section of a group control (0x20) message.
 
-def _group_control_data(
-    zone: int, power: PowerCommand, percentage: int | None
-) -> bytes:
-    """Build the data section of a group control (0x20) message."""
-    setting = SETTING_SET_PERCENTAGE if percentage is not None else 0
+    Each zone gets its own repeat entry, so any number of zones can be
+    controlled with a single message.
+    """
     # The spec documents the repeat count before the repeat length, but real
     # firmware uses the opposite order (confirmed against a live system,
     # whose status messages are laid out the same way).
-    return bytes(
+    data = bytearray(
         (
             SUBTYPE_GROUP_CONTROL, 0x00,  # sub type, keep 0
             0x00, 0x00,  # common data length
             0x00, 0x04,  # each repeat data length
-            0x00, 0x01,  # repeat data count
-            zone & 0x3F,
-            setting | power,
-            percentage if percentage is not None else KEEP_PERCENTAGE,
-            0x00,
+            *len(commands).to_bytes(2, "big"),  # repeat data count
         )
     )
+    for zone, (power, percentage) in sorted(commands.items()):
+        setting = SETTING_SET_PERCENTAGE if percentage is not None else 0
+        data += bytes(
+            (
+                zone & 0x3F,
+                setting | power,
+                percentage if percentage is not None else KEEP_PERCENTAGE,
+                0x00,
+            )
+        )
+    return bytes(data)
+
+
+def _check_commands(commands: Mapping[int, ZoneCommand]) -> None:
+    if not commands:
+        raise ValueError("No zones to control")
+    for zone, (_, percentage) in commands.items():
+        if not 0 <= zone <= 15:
+            raise ValueError(f"Zone number must be 0-15, got {zone}")
+        if percentage is not None and not 0 <= percentage <= 100:
+            raise ValueError(f"Percentage must be 0-100, got {percentage}")
 
 
 _STATUS_REQUEST = build_message(
@@ -187,6 +372,24 @@ _NAMES_REQUEST = build_message(ADDRESS_EXTENDED, TYPE_EXTENDED, EXTENDED_GROUP_N
 _INFO_REQUEST = build_message(ADDRESS_EXTENDED, TYPE_EXTENDED, EXTENDED_SYSTEM_INFO)
 
 
+@lru_cache(maxsize=1024)
+def _control_frame(commands: tuple[tuple[int, ZoneCommand], ...]) -> bytes:
+    """Complete group control frame for (zone, command) pairs sorted by zone.
+
+    Installations send the same few settings over and over, so frames are
+    built once, like the fixed requests above, and then reused.
+    """
+    return build_message(
+        ADDRESS_CONTROL, TYPE_CONTROL, _group_control_data(dict(commands))
+    )
+
+
+def control_frame_cache_stats() -> dict[str, int]:
+    """Hits, misses and size of the cache of built control frames."""
+    info = _control_frame.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
 def _is_group_status(msg_type: int, data: bytes) -> bool:
     return msg_type == TYPE_CONTROL and data[:1] == bytes((SUBTYPE_GROUP_STATUS,))
 
@@ -199,114 +402,531 @@ def _is_system_info(msg_type: int, data: bytes) -> bool:
     return msg_type == TYPE_EXTENDED and data[:2] == EXTENDED_SYSTEM_INFO
 
 
-class _FrameReader:
-    """Reads bytes from a stream, removing stuffed 0x00 bytes on the fly."""
+@dataclass(slots=True)
+class DecoderStats:
+    """Counters kept by FrameDecoder; one instance can be shared by several."""
 
-    def __init__(self, reader: asyncio.StreamReader) -> None:
-        self._reader = reader
-        self._run = 0
-        self.raw = bytearray()  # everything read, including stuffed bytes
-
-    async def read(self, count: int) -> bytes:
-        out = bytearray()
-        while len(out) < count:
-            byte = (await self._reader.readexactly(1))[0]
-            self.raw.append(byte)
-            if self._run == 3:
-                self._run = 0
-                if byte == 0x00:
-                    continue  # stuffed byte, drop it
-            self._run = self._run + 1 if byte == 0x55 else 0
-            out.append(byte)
-        return bytes(out)
-
-
-async def _read_frame(reader: asyncio.StreamReader) -> tuple[bytes, int, bytes]:
-    """Read one frame and return (address, message type, unstuffed data)."""
-    window = bytearray()
-    while bytes(window[-4:]) != HEADER:
-        window.extend(await reader.readexactly(1))
-        if len(window) > _MAX_HEADER_SEARCH:
-            raise ZoneTouch3ProtocolError("Frame header not found in stream")
-
-    frame = _FrameReader(reader)
-    preamble = await frame.read(6)  # address(2) + id(1) + type(1) + length(2)
-    address = preamble[:2]
-    msg_type = preamble[3]
-    length = int.from_bytes(preamble[4:6], "big")
-    if length > _MAX_DATA_LENGTH:
-        raise ZoneTouch3ProtocolError(f"Implausible data length {length}")
-
-    data = await frame.read(length)
-    raw_body = bytes(frame.raw)  # body as transmitted, before the CRC
-    crc = await frame.read(2)
-
-    # The spec text says the CRC excludes stuffed bytes, but the spec's own
-    # example includes them. Accept either.
-    if crc not in (_crc16(raw_body), _crc16(preamble + data)):
-        raise ZoneTouch3ProtocolError(
-            f"CRC mismatch on frame: {(HEADER + raw_body).hex()} crc={crc.hex()}"
+    bytes_in: int = 0
+    frames: int = 0
+    crc_mismatches: int = 0
+    # Frames containing stuffed bytes, by whether their CRC covered them.
+    crc_with_stuffing: int = 0
+    crc_without_stuffing: int = 0
+    # Times the decoder dropped corrupt data and resynchronised on a header.
+    resyncs: int = 0
+    bytes_skipped: int = 0
+
+
+class LatencyStats:
+    """Durations of the most recent operations, with percentiles.
+
+    Adding a sample is O(1); percentiles are computed when read, from at most
+    size samples.
+    """
+
+    def __init__(self, size: int = 256) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        """Record one duration."""
+        self._samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the given percentile (0-1) in seconds, None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> dict[str, float | None]:
+        """p50, p95 and p99 in milliseconds."""
+        summary: dict[str, float | None] = {}
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            value = self.percentile(fraction)
+            summary[name] = None if value is None else value * 1000
+        return summary
+
+
+class Priority(IntEnum):
+    """Order in which ZoneTouch3Client operations take their turn."""
+
+    COMMAND = 0
+    POLL = 1
+
+
+class _PriorityLock:
+    """A lock handed to waiters by priority, in arrival order within one."""
+
+    def __init__(self) -> None:
+        self._locked = False
+        self._waiters: list[tuple[Priority, int, asyncio.Future[None]]] = []
+        self._arrivals = itertools.count()
+
+    async def acquire(self, priority: Priority) -> None:
+        if not self._locked:
+            self._locked = True
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # handed over just as the waiter was cancelled
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # the lock passes on still held
+                return
+        self._locked = False
+
+
+@dataclass
+class ClientMetrics:
+    """Counters and latencies recorded by ZoneTouch3Client."""
+
+    operations: int = 0
+    failures: int = 0
+    connects: int = 0
+    connect_failures: int = 0
+    frames_skipped: int = 0
+    bytes_out: int = 0
+    requeries: int = 0  # requests sent again after corrupt data
+    decoder: DecoderStats = field(default_factory=DecoderStats)
+    round_trip: LatencyStats = field(default_factory=LatencyStats)
+    connect_time: LatencyStats = field(default_factory=LatencyStats)
+    # How long operations waited for their turn, by priority.
+    queue_wait: dict[Priority, LatencyStats] = field(
+        default_factory=lambda: {priority: LatencyStats() for priority in Priority}
+    )
+    stale_polls: int = 0  # polls answered by a newer group status instead
+    _outcomes: deque[bool] = field(default_factory=lambda: deque(maxlen=100))
+
+    def record_outcome(self, ok: bool) -> None:
+        """Count one operation and whether it succeeded."""
+        self.operations += 1
+        if not ok:
+            self.failures += 1
+        self._outcomes.append(ok)
+
+    @property
+    def error_rate(self) -> float | None:
+        """Fraction of the last 100 operations that failed."""
+        if not self._outcomes:
+            return None
+        return self._outcomes.count(False) / len(self._outcomes)
+
+
+class BreakerState(StrEnum):
+    """State of a CircuitBreaker."""
+
+    CLOSED = "closed"  # the console is reachable
+    OPEN = "open"  # failing fast until the backoff ends
+    HALF_OPEN = "half_open"  # probing whether the console is back
+
+
+class CircuitBreaker:
+    """Tracks connection failures so an unreachable console fails fast.
+
+    After threshold consecutive failures the breaker opens: attempts are
+    refused until a backoff has passed, which starts at base_delay and doubles
+    with every further failure up to max_delay, with +/-20% jitter. The first
+    attempt after the backoff is a probe (half open); its success closes the
+    breaker and its failure opens it again for longer.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        base_delay: float = RECONNECT_DELAY,
+        max_delay: float = MAX_RECONNECT_DELAY,
+    ) -> None:
+        self._threshold = threshold
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.failures = 0  # consecutive
+        self.state = BreakerState.CLOSED
+        self._retry_at = 0.0  # time.monotonic()
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next attempt is allowed (0 unless open)."""
+        if self.state is not BreakerState.OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def retry_delay(self) -> float:
+        """How long to wait before the next attempt, with jitter."""
+        if self.state is BreakerState.OPEN:
+            return self.retry_in
+        return self._base_delay * random.uniform(0.8, 1.2)
+
+    def check(self) -> bool:
+        """Allow an attempt, returning whether it is a probe.
+
+        Raises ZoneTouch3CircuitOpenError while the backoff runs or another
+        attempt is already probing.
+        """
+        if self.state is BreakerState.CLOSED:
+            return False
+        if self.state is BreakerState.OPEN and self.retry_in == 0:
+            self.state = BreakerState.HALF_OPEN
+            return True
+        raise self.open_error()
+
+    def open_error(self) -> ZoneTouch3CircuitOpenError:
+        """The error for an attempt refused while failing fast."""
+        return ZoneTouch3CircuitOpenError(
+            f"Console unreachable after {self.failures} attempts; "
+            f"retrying in {self.retry_in:.1f} s"
+        )
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.failures = 0
+        self.state = BreakerState.CLOSED
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold."""
+        self.failures += 1
+        if self.failures < self._threshold:
+            self.state = BreakerState.CLOSED
+            return
+        delay = min(
+            self._base_delay * 2 ** (self.failures - self._threshold),
+            self._max_delay,
         )
-    return address, msg_type, data
+        self.state = BreakerState.OPEN
+        self._retry_at = time.monotonic() + delay * random.uniform(0.8, 1.2)
+
+
+class Frame(NamedTuple):
+    """A decoded frame."""
+
+    address: bytes
+    msg_type: int
+    data: bytes
+
+
+class _CorruptFrame(Exception):
+    """Raised inside FrameDecoder to abandon the frame being decoded."""
+
+
+class FrameDecoder:
+    """Incremental, sans-IO frame decoder.
+
+    Bytes are fed in whatever chunks the transport delivers and complete
+    frames are returned as soon as they are available. Header search, removal
+    of stuffed bytes and length tracking work on whole chunks at a time, so
+    the cost per frame does not depend on how the bytes were split up.
+
+    Corruption never stops the stream. Bytes outside frames are skipped, and
+    a frame with an implausible length, a bad CRC or a header inside it is
+    dropped. Decoding resumes at the next header. Byte stuffing guarantees
+    that a header cannot occur inside an intact frame, so at most the frames
+    the corruption touched are lost. Each of these events counts as a resync.
+    """
 
+    def __init__(self, stats: DecoderStats | None = None) -> None:
+        self.stats = stats if stats is not None else DecoderStats()
+        self.resyncs = 0  # of this decoder; stats may be shared
+        self._buffer = bytearray()
+        self._skipping = False  # dropping bytes while looking for a header
+        self._reset()
+
+    def _reset(self) -> None:
+        self._in_frame = False
+        self._pos = 0  # next byte of the buffer to unstuff
+        self._run = 0  # consecutive 0x55 bytes just before _pos
+        self._body = bytearray()  # unstuffed address, id, type, length, data, CRC
+        self._body_end = -1  # buffer offset of the CRC, once known
+        # The spec text says the CRC excludes stuffed bytes, but the spec's
+        # own example includes them. Both are accumulated while unstuffing.
+        self._crc_stuffed = _CRC16_INIT
+        self._crc_unstuffed = _CRC16_INIT
+
+    def feed(self, chunk: bytes) -> list[Frame]:
+        """Add received bytes and return the frames they complete."""
+        self.stats.bytes_in += len(chunk)
+        self._buffer += chunk
+        frames: list[Frame] = []
+        while (frame := self._next_frame()) is not None:
+            frames.append(frame)
+        return frames
+
+    def _next_frame(self) -> Frame | None:
+        while True:
+            try:
+                return self._decode_frame()
+            except _CorruptFrame as err:
+                _LOGGER.debug("Resynchronising: %s", err)
+                # Bytes consumed by the frame are kept: the next header can
+                # be among them. Skipping the rest is part of this resync.
+                self._reset()
+                self._count_resync()
+                self._skipping = True
+
+    def _decode_frame(self) -> Frame | None:
+        """Decode the next frame, or return None if more bytes are needed."""
+        buffer = self._buffer
+        if not self._in_frame:
+            start = buffer.find(HEADER)
+            if start < 0:
+                # Keep what could be the start of a header split across chunks.
+                self._skip(len(buffer) - (len(HEADER) - 1))
+                return None
+            self._skip(start)
+            del buffer[: len(HEADER)]
+            self._in_frame = True
+            self._skipping = False
+
+        if not self._unstuff(6):  # address(2) + id(1) + type(1) + length(2)
+            return None
+        body = self._body
+        length = int.from_bytes(body[4:6], "big")
+        if length > _MAX_DATA_LENGTH:
+            raise _CorruptFrame(f"implausible data length {length}")
+
+        if self._body_end < 0:
+            if not self._unstuff(6 + length):
+                return None
+            if self._run == 3:  # a stuffed byte may follow the last data byte
+                if self._pos == len(buffer):
+                    return None
+                self._run = 0
+                if buffer[self._pos] == 0x00:
+                    self._pos += 1
+                    self._crc_stuffed = _crc16_update(self._crc_stuffed, b"\x00")
+            self._body_end = self._pos
+        if not self._unstuff(8 + length):
+            return None
+
+        crc = int.from_bytes(body[-2:], "big")
+        stats = self.stats
+        if crc not in (self._crc_stuffed, self._crc_unstuffed):
+            stats.crc_mismatches += 1
+            raw_body = bytes(buffer[: self._body_end])  # as transmitted
+            raise _CorruptFrame(
+                f"CRC mismatch on frame {(HEADER + raw_body).hex()} crc={crc:04x}"
+            )
+        stats.frames += 1
+        if self._crc_stuffed != self._crc_unstuffed:
+            if crc == self._crc_stuffed:
+                stats.crc_with_stuffing += 1
+            else:
+                stats.crc_without_stuffing += 1
+        frame = Frame(bytes(body[:2]), body[3], bytes(body[6:-2]))
+        self._discard()
+        return frame
+
+    def _unstuff(self, target: int) -> bool:
+        """Unstuff buffered bytes until the body is target bytes long.
+
+        Runs of 0x55 are located with bytearray.find, and everything between
+        them is copied in one slice. Until the end of the data is known, both
+        CRC variants are updated with each slice as it is copied. Returns
+        whether the target was reached.
+        """
+        buffer, body = self._buffer, self._body
+        pos, run, end = self._pos, self._run, len(self._buffer)
+        track_crc = self._body_end < 0
+        crc_stuffed, crc_unstuffed = self._crc_stuffed, self._crc_unstuffed
+        while len(body) < target and pos < end:
+            if run == 3:
+                run = 0
+                if buffer[pos] == 0x00:
+                    pos += 1  # stuffed byte, drop it
+                    if track_crc:
+                        crc_stuffed = _crc16_update(crc_stuffed, b"\x00")
+                    continue
+                if buffer[pos] == HEADER[-1]:
+                    raise _CorruptFrame("frame header inside frame")
+            limit = min(end, pos + target - len(body))
+            # The run of 0x55 bytes before pos may complete a triple.
+            found = buffer.find(_STUFF_RUN, pos - run, limit)
+            stop = limit if found < 0 else found + 3
+            segment = buffer[pos:stop]
+            body += segment
+            if track_crc:
+                crc_stuffed = _crc16_update(crc_stuffed, segment)
+                crc_unstuffed = _crc16_update(crc_unstuffed, segment)
+            if found < 0:
+                # Carry any trailing 0x55 bytes over as the start of a run.
+                floor, run = pos - run, 0
+                while run < 2 and limit - run > floor:
+                    if buffer[limit - run - 1] != 0x55:
+                        break
+                    run += 1
+            else:
+                run = 3
+            pos = stop
+        self._pos, self._run = pos, run
+        self._crc_stuffed, self._crc_unstuffed = crc_stuffed, crc_unstuffed
+        return len(body) >= target
+
+    def _discard(self) -> None:
+        """Drop the current frame's bytes and look for the next header."""
+        del self._buffer[: self._pos]
+        self._reset()
+
+    def _skip(self, count: int) -> None:
+        """Drop count bytes that precede any header."""
+        if count <= 0:
+            return
+        del self._buffer[:count]
+        self.stats.bytes_skipped += count
+        if not self._skipping:
+            self._skipping = True
+            _LOGGER.debug("Skipping bytes outside frames")
+            self._count_resync()
+
+    def _count_resync(self) -> None:
+        self.resyncs += 1
+        self.stats.resyncs += 1
+
+
+class Direction(IntEnum):
+    """Which way captured bytes went."""
+
+    SENT = 0
+    RECEIVED = 1
+
+
+# Receives every chunk of raw bytes sent to or received from the console.
+Capture = Callable[[Direction, bytes], None]
+
+
+class _FrameStream:
+    """Reads frames from a stream in large chunks through a FrameDecoder."""
 
-def _parse_group_status(data: bytes) -> dict[int, ZoneStatus]:
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        stats: DecoderStats | None = None,
+        capture: Capture | None = None,
+    ) -> None:
+        self._reader = reader
+        self._decoder = FrameDecoder(stats)
+        self._capture = capture
+        self._frames: deque[Frame] = deque()
+        # Called when corrupt data was dropped, e.g. to ask for lost responses
+        # again rather than wait for them to time out.
+        self.on_resync: Callable[[], None] | None = None
+
+    async def read_frame(self) -> Frame:
+        while not self._frames:
+            chunk = await self._reader.read(_READ_SIZE)
+            if not chunk:
+                raise ConnectionResetError("Connection closed by the console")
+            if self._capture is not None:
+                self._capture(Direction.RECEIVED, chunk)
+            resyncs = self._decoder.resyncs
+            self._frames.extend(self._decoder.feed(chunk))
+            if self._decoder.resyncs != resyncs and self.on_resync is not None:
+                self.on_resync()
+        return self._frames.popleft()
+
+
+def _parse_group_status(
+    data: bytes, names: Mapping[int, str] | None = None
+) -> dict[int, ZoneStatus]:
     """Parse a group status (0x21) message into per-zone status.
 
+    Group status carries no names; they are taken from names if given.
+
     The spec puts the repeat count in bytes 5-6 and the per-group data
     length in bytes 7-8, but real firmware sends them the other way around
     (e.g. 0x0008/0x0005 for five zones of eight bytes). Both orderings fit
     the payload size, so the two fields are disambiguated by checking under
     which interpretation the zone numbers are valid and unique.
+
+    Fields are read in place; nothing is allocated but the result.
     """
     if len(data) < 8:
         raise ZoneTouch3ProtocolError("Group status message too short")
-    common_length = int.from_bytes(data[2:4], "big")
-    field_a = int.from_bytes(data[4:6], "big")
-    field_b = int.from_bytes(data[6:8], "big")
+    common_length, field_a, field_b = _GROUP_STATUS_HEADER.unpack_from(data, 2)
     start = 8 + common_length
     total = len(data) - start
 
     def plausible(count: int, each: int) -> bool:
         if not (0 < count <= 16 and each >= 2 and count * each == total):
             return False
-        numbers = [data[start + i * each] & 0x3F for i in range(count)]
-        return len(set(numbers)) == count and all(n <= 15 for n in numbers)
+        seen = 0  # bit per zone number
+        for offset in range(start, len(data), each):
+            number = data[offset] & 0x3F
+            if number > 15 or seen >> number & 1:
+                return False
+            seen |= 1 << number
+        return True
 
     if total == 0:
         return {}
-    if plausible(field_a, field_b):  # documented order: count, length
-        count, each_length = field_a, field_b
-    elif plausible(field_b, field_a):  # order seen from real firmware
-        count, each_length = field_b, field_a
-    else:
+    # documented order (count, length) and the order seen from real firmware
+    candidates = [
+        (count, each)
+        for count, each in ((field_a, field_b), (field_b, field_a))
+        if plausible(count, each)
+    ]
+    if not candidates:
         raise ZoneTouch3ProtocolError(
             f"Cannot interpret group status message: {data.hex()}"
         )
+    # Both can fit: sixteen 8-byte groups also read as eight 16-byte groups
+    # with valid zone numbers (0, 2, 4, ...). Groups are 8 bytes in practice,
+    # so the reading with more, shorter groups wins.
+    _, each_length = max(candidates)
 
     zones: dict[int, ZoneStatus] = {}
-    offset = start
-    for _ in range(count):
-        group = data[offset : offset + each_length]
-        power_bits = (group[0] >> 6) & 0b11
-        try:
-            power = PowerState(power_bits)
-        except ValueError:
-            power = PowerState.OFF
-        number = group[0] & 0x3F
-        zones[number] = ZoneStatus(
-            number=number,
-            power=power,
-            percentage=group[1] & 0x7F,
-            turbo_supported=bool(group[6] >> 7) if each_length >= 7 else False,
-            spill_active=bool((group[6] >> 1) & 1) if each_length >= 7 else False,
+    flags_offset = 6 if each_length >= 7 else None
+    for offset in range(start, len(data), each_length):
+        first = data[offset]
+        number = first & 0x3F
+        zones[number] = _zone_status(
+            first,
+            data[offset + 1] & 0x7F,
+            0 if flags_offset is None else data[offset + flags_offset] & _ZONE_FLAGS,
+            names.get(number, "") if names else "",
         )
-        offset += each_length
     return zones
 
 
-def _decode_text(raw: bytes) -> str:
-    return raw.split(b"\x00")[0].decode("utf-8", errors="replace").strip()
+_GROUP_STATUS_HEADER = struct.Struct(">HHH")  # common length, two repeat fields
+_ZONE_TURBO = 0x80  # group status byte 7 flags
+_ZONE_SPILL = 0x02
+_ZONE_FLAGS = _ZONE_TURBO | _ZONE_SPILL
+
+
+@lru_cache(maxsize=256)
+def _zone_status(first: int, percentage: int, flags: int, name: str) -> ZoneStatus:
+    """Build the status of one zone from its group status fields.
+
+    Zone status is immutable, so results are cached: a zone that has not
+    changed since the last message comes back as the same object.
+    """
+    try:
+        power = PowerState(first >> 6)
+    except ValueError:
+        power = PowerState.OFF
+    return ZoneStatus(
+        number=first & 0x3F,
+        power=power,
+        percentage=percentage,
+        turbo_supported=bool(flags & _ZONE_TURBO),
+        spill_active=bool(flags & _ZONE_SPILL),
+        name=name,
+    )
+
+
+def _decode_text(data: bytes, offset: int, length: int) -> str:
+    """Decode the NUL-padded text field at offset in data."""
+    # One slice per field: cheaper for these short fields than memoryview.
+    text = data[offset : offset + length].decode("utf-8", errors="replace")
+    return text.partition("\x00")[0].strip()
 
 
 def _parse_group_names(data: bytes) -> dict[int, str]:
@@ -316,67 +936,192 @@ def _parse_group_names(data: bytes) -> dict[int, str]:
     name_length = data[2]
     entry_length = 1 + name_length  # group number + name
     names: dict[int, str] = {}
-    offset = 3
-    while offset + entry_length <= len(data):
-        names[data[offset]] = _decode_text(data[offset + 1 : offset + entry_length])
-        offset += entry_length
+    for offset in range(3, len(data) - entry_length + 1, entry_length):
+        # Names are kept for the life of the entry; intern them once.
+        names[data[offset]] = sys.intern(
+            _decode_text(data, offset + 1, name_length)
+        )
     return names
 
 
-def _parse_system_info(data: bytes) -> SystemInfo:
-    """Parse the undocumented system information (0xFF 0xF0) message."""
+_UINT16 = struct.Struct(">H")
 
-    def text(offset: int, length: int) -> str:
-        return _decode_text(data[offset : offset + length])
 
+def _parse_system_info(data: bytes) -> SystemInfo:
+    """Parse the undocumented system information (0xFF 0xF0) message."""
     raw_temp_offset, raw_temp_length = _INFO_CONSOLE_TEMP
-    raw_temp = int.from_bytes(
-        data[raw_temp_offset : raw_temp_offset + raw_temp_length], "big"
-    )
+    if len(data) >= raw_temp_offset + raw_temp_length:
+        (raw_temp,) = _UINT16.unpack_from(data, raw_temp_offset)
+    else:  # truncated; use whatever is there, like the text fields
+        raw_temp = int.from_bytes(data[raw_temp_offset:], "big")
     return SystemInfo(
-        system_id=text(*_INFO_SYSTEM_ID),
-        name=text(*_INFO_SYSTEM_NAME),
-        installer=text(*_INFO_INSTALLER),
-        installer_phone=text(*_INFO_INSTALLER_PHONE),
-        firmware_version=text(*_INFO_FIRMWARE_VERSION),
-        console_version=text(*_INFO_CONSOLE_VERSION),
+        system_id=_decode_text(data, *_INFO_SYSTEM_ID),
+        name=_decode_text(data, *_INFO_SYSTEM_NAME),
+        installer=_decode_text(data, *_INFO_INSTALLER),
+        installer_phone=_decode_text(data, *_INFO_INSTALLER_PHONE),
+        firmware_version=_decode_text(data, *_INFO_FIRMWARE_VERSION),
+        console_version=_decode_text(data, *_INFO_CONSOLE_VERSION),
         temperature=(raw_temp - 500) / 10 if raw_temp else None,
     )
 
 
+Matcher = Callable[[int, bytes], bool]
+# A request frame and the matcher recognising its response.
+Request = tuple[bytes, Matcher]
+Exchange = Callable[..., Awaitable[list[bytes]]]
+StatusListener = Callable[[dict[int, ZoneStatus]], None]
+ConnectionListener = Callable[[bool], None]
+
+
+@dataclass
+class _PendingRequest:
+    """A request sent on the persistent connection awaiting its response."""
+
+    request: bytes
+    matches: Matcher
+    future: asyncio.Future[bytes]
+    skipped: list[str] = field(default_factory=list)
+
+
 class ZoneTouch3Client:
-    """Client that opens a short-lived TCP connection per operation."""
+    """Client for a ZoneTouch 3 console.
+
+    By default a short-lived TCP connection is opened per operation. After
+    async_start() the client instead keeps one connection open, reconnects
+    whenever it drops, and hands the group status messages the console pushes
+    on its own (e.g. after a change at the wall console) to status listeners.
+
+    Connection failures are tracked by a CircuitBreaker: once the console has
+    been unreachable a few times, operations fail immediately with
+    ZoneTouch3CircuitOpenError instead of each waiting for the timeout, and
+    reconnects back off exponentially. A status request probes the console
+    before the breaker closes again.
+
+    Operations take turns by Priority: a control command waiting for its
+    turn goes ahead of any waiting poll, so it waits for at most the one
+    exchange already in progress. A poll whose turn comes after a group
+    status message arrived (the reply to a command, or pushed) takes the
+    zone status from that message instead of requesting it again.
+
+    If capture is given it is called with every chunk of bytes sent and
+    received, e.g. to record traffic with capture.CaptureWriter.
+    """
 
     def __init__(
-        self, host: str, port: int = DEFAULT_PORT, timeout: float = DEFAULT_TIMEOUT
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        timeout: float = DEFAULT_TIMEOUT,
+        capture: Capture | None = None,
     ) -> None:
         self._host = host
         self._port = port
         self._timeout = timeout
-        self._lock = asyncio.Lock()
+        self._turns = _PriorityLock()
+        # The latest status of all zones: when it changed (time.monotonic())
+        # and the zones.
+        self._status: tuple[float, dict[int, ZoneStatus]] | None = None
+        self._status_listeners: list[StatusListener] = []
+        self._connection_listeners: list[ConnectionListener] = []
+        self._run_task: asyncio.Task[None] | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._connected = asyncio.Event()
+        self._pending: list[_PendingRequest] = []
+        self.metrics = ClientMetrics()
+        self.breaker = CircuitBreaker()
+        self._capture = capture
+
+    @property
+    def connected(self) -> bool:
+        """Whether the persistent connection is currently up."""
+        return self._connected.is_set()
+
+    def add_status_listener(self, listener: StatusListener) -> Callable[[], None]:
+        """Call listener with every pushed group status; returns a remover."""
+        self._status_listeners.append(listener)
+        return partial(self._status_listeners.remove, listener)
+
+    def add_connection_listener(
+        self, listener: ConnectionListener
+    ) -> Callable[[], None]:
+        """Call listener when the persistent connection goes up or down."""
+        self._connection_listeners.append(listener)
+        return partial(self._connection_listeners.remove, listener)
+
+    async def async_start(self) -> None:
+        """Switch to a persistent connection maintained in the background."""
+        if self._run_task is None:
+            self._run_task = asyncio.create_task(self._run())
+
+    async def async_stop(self) -> None:
+        """Close the persistent connection and stop reconnecting."""
+        task, self._run_task = self._run_task, None
+        if task is None:
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
 
     async def async_get_state(self) -> ZoneTouchState:
-        """Fetch zone status, zone names and system information."""
-        async with self._lock:
-            reader, writer = await self._open()
-            try:
-                zones = _parse_group_status(
-                    await self._exchange(reader, writer, _STATUS_REQUEST, _is_group_status)
-                )
-                names = _parse_group_names(
-                    await self._exchange(reader, writer, _NAMES_REQUEST, _is_group_names)
-                )
-                system = _parse_system_info(
-                    await self._exchange(reader, writer, _INFO_REQUEST, _is_system_info)
-                )
-            finally:
-                await self._close(writer)
+        """Fetch zone status, zone names and system information.
 
-        for number, name in names.items():
-            if number in zones:
-                zones[number].name = name
+        All requests are sent at once and the responses matched as they
+        arrive, so this costs about one round trip rather than three. The
+        status is not requested if a newer one arrived while waiting.
+        """
+        requests: list[Request] = [
+            (_NAMES_REQUEST, _is_group_names),
+            (_INFO_REQUEST, _is_system_info),
+        ]
+        queued = time.monotonic()
+        async with self._turn(Priority.POLL):
+            if (zones := self._status_since(queued)) is None:
+                requests.append((_STATUS_REQUEST, _is_group_status))
+            # Replies are parsed in the session, so a reply that cannot be
+            # understood counts as a failed exchange.
+            async with self._session() as exchange:
+                names_data, info_data, *status_data = await exchange(*requests)
+                names = _parse_group_names(names_data)
+                if status_data:
+                    zones = _parse_group_status(status_data[0], names)
+                    self._note_status(zones, complete=True)
+                system = _parse_system_info(info_data)
+        if not status_data:
+            zones = {
+                number: replace(status, name=names.get(number, ""))
+                for number, status in cast(dict[int, ZoneStatus], zones).items()
+            }
         return ZoneTouchState(system=system, zones=zones)
 
+    async def async_identify(self) -> SystemInfo:
+        """Check that the device answers like a console; return its information.
+
+        Group status is the cheapest request a console answers, and no other
+        device on port 7030 will answer it; the system information request
+        goes out with it to learn which console this is.
+        """
+        async with self._turn(Priority.POLL), self._session() as exchange:
+            _, info_data = await exchange(
+                (_STATUS_REQUEST, _is_group_status),
+                (_INFO_REQUEST, _is_system_info),
+            )
+            return _parse_system_info(info_data)
+
+    async def async_get_zones(self) -> dict[int, ZoneStatus]:
+        """Fetch only the zone status, without names.
+
+        Nothing is requested if a newer status arrived while waiting.
+        """
+        queued = time.monotonic()
+        async with self._turn(Priority.POLL):
+            if (zones := self._status_since(queued)) is not None:
+                return zones
+            async with self._session() as exchange:
+                (data,) = await exchange((_STATUS_REQUEST, _is_group_status))
+                zones = _parse_group_status(data)
+        self._note_status(zones, complete=True)
+        return zones
+
     async def async_set_zone(
         self,
         zone: int,
@@ -384,32 +1129,115 @@ class ZoneTouch3Client:
         percentage: int | None = None,
     ) -> dict[int, ZoneStatus]:
         """Control one zone and return the group status the device replies with."""
-        if not 0 <= zone <= 15:
-            raise ValueError(f"Zone number must be 0-15, got {zone}")
-        if percentage is not None and not 0 <= percentage <= 100:
-            raise ValueError(f"Percentage must be 0-100, got {percentage}")
+        return await self.async_set_zones({zone: (power, percentage)})
 
-        request = build_message(
-            ADDRESS_CONTROL, TYPE_CONTROL, _group_control_data(zone, power, percentage)
-        )
-        async with self._lock:
-            reader, writer = await self._open()
-            try:
-                return _parse_group_status(
-                    await self._exchange(reader, writer, request, _is_group_status)
-                )
-            finally:
-                await self._close(writer)
+    async def async_set_zones(
+        self, commands: Mapping[int, ZoneCommand]
+    ) -> dict[int, ZoneStatus]:
+        """Control several zones with a single message.
+
+        commands maps zone numbers to (power, percentage) pairs, where a
+        percentage of None keeps the current setting. Returns the group status
+        the device replies with.
+        """
+        _check_commands(commands)
+        request = _control_frame(tuple(sorted(commands.items())))
+        async with self._turn(Priority.COMMAND), self._session() as exchange:
+            (data,) = await exchange((request, _is_group_status))
+            zones = _parse_group_status(data)
+        self._note_status(zones, complete=False)
+        return dict(zones)
+
+    @asynccontextmanager
+    async def _turn(self, priority: Priority) -> AsyncIterator[None]:
+        """Wait for the client's turn, recording how long that took."""
+        start = time.monotonic()
+        await self._turns.acquire(priority)
+        try:
+            self.metrics.queue_wait[priority].add(time.monotonic() - start)
+            yield
+        finally:
+            self._turns.release()
+
+    def _note_status(self, zones: dict[int, ZoneStatus], *, complete: bool) -> None:
+        """Record the status of all zones for polls to reuse.
+
+        Pushes and command replies may cover only some zones, so unless
+        complete they are merged into the last complete status, and dropped
+        if there is none yet.
+        """
+        if complete:
+            self._status = (time.monotonic(), zones)
+        elif self._status is not None:
+            self._status = (time.monotonic(), {**self._status[1], **zones})
+
+    def _status_since(self, since: float) -> dict[int, ZoneStatus] | None:
+        """The status of all zones as of at or after since, if known."""
+        if self._status is None or self._status[0] < since:
+            return None
+        self.metrics.stale_polls += 1
+        _LOGGER.debug("Using the group status received while waiting to poll")
+        return dict(self._status[1])
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[Exchange]:
+        """Provide an exchange function on the current or a new connection."""
+        try:
+            if self._run_task is not None:
+                failing = self.breaker.state is not BreakerState.CLOSED
+                if failing and not self.connected:
+                    raise self.breaker.open_error()
+                try:
+                    await asyncio.wait_for(self._connected.wait(), self._timeout)
+                except TimeoutError as err:
+                    raise ZoneTouch3ConnectionError(
+                        f"Not connected to {self._host}:{self._port}"
+                    ) from err
+                yield self._exchange_persistent
+            else:
+                probe = self.breaker.check()
+                try:
+                    reader, writer = await self._open()
+                    try:
+                        exchange = partial(
+                            self._exchange,
+                            _FrameStream(
+                                reader, self.metrics.decoder, self._capture
+                            ),
+                            writer,
+                        )
+                        if probe:
+                            await exchange((_STATUS_REQUEST, _is_group_status))
+                        yield exchange
+                    finally:
+                        await self._close(writer)
+                except ZoneTouch3ConnectionError:
+                    self.breaker.record_failure()
+                    raise
+                except BaseException:
+                    if self.breaker.state is BreakerState.HALF_OPEN:
+                        self.breaker.record_failure()  # probe did not finish
+                    raise
+                self.breaker.record_success()
+        except ZoneTouch3Error:
+            self.metrics.record_outcome(False)
+            raise
+        self.metrics.record_outcome(True)
 
     async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        start = time.monotonic()
         try:
-            return await asyncio.wait_for(
+            connection = await asyncio.wait_for(
                 asyncio.open_connection(self._host, self._port), self._timeout
             )
         except (OSError, TimeoutError) as err:
+            self.metrics.connect_failures += 1
             raise ZoneTouch3ConnectionError(
                 f"Could not connect to {self._host}:{self._port}: {err}"
             ) from err
+        self.metrics.connects += 1
+        self.metrics.connect_time.add(time.monotonic() - start)
+        return connection
 
     @staticmethod
     async def _close(writer: asyncio.StreamWriter) -> None:
@@ -421,36 +1249,379 @@ class ZoneTouch3Client:
 
     async def _exchange(
         self,
-        reader: asyncio.StreamReader,
+        stream: _FrameStream,
         writer: asyncio.StreamWriter,
-        request: bytes,
-        matches: Callable[[int, bytes], bool],
-    ) -> bytes:
-        """Send a request and return the data of the first matching response.
+        *requests: Request,
+    ) -> list[bytes]:
+        """Send requests and return the data of their matching responses.
 
+        All requests are written at once and each frame that arrives is
+        matched to the first request still waiting for a response it fits.
         The device sends group status messages on its own whenever a zone
         changes (e.g. from the wall console), so unrelated frames may arrive
-        before the response we are waiting for; those are skipped.
+        before the responses we are waiting for; those are skipped.
         """
+        start = time.monotonic()
+        responses: list[bytes | None] = [None] * len(requests)
+        stream.on_resync = lambda: self._requery(
+            writer,
+            [
+                request
+                for request, response in zip(requests, responses)
+                if response is None
+            ],
+        )
         try:
-            writer.write(request)
+            self._write(writer, requests)
             await asyncio.wait_for(writer.drain(), self._timeout)
             skipped: list[str] = []
-            for _ in range(_MAX_FRAME_SKIP):
-                _, msg_type, data = await asyncio.wait_for(
-                    _read_frame(reader), self._timeout
-                )
-                _LOGGER.debug(
-                    "Received frame type 0x%02X data=%s", msg_type, data.hex()
-                )
-                if matches(msg_type, data):
-                    return data
-                skipped.append(f"type=0x{msg_type:02X} data={data.hex()}")
-            raise ZoneTouch3ProtocolError(
-                f"No matching response to {request.hex()}; "
-                f"received: {'; '.join(skipped)}"
+            async with asyncio.timeout(self._timeout):
+                while None in responses:
+                    _, msg_type, data = await stream.read_frame()
+                    _LOGGER.debug(
+                        "Received frame type 0x%02X data=%s", msg_type, data.hex()
+                    )
+                    for index, (_, matches) in enumerate(requests):
+                        if responses[index] is None and matches(msg_type, data):
+                            responses[index] = data
+                            break
+                    else:
+                        self.metrics.frames_skipped += 1
+                        skipped.append(f"type=0x{msg_type:02X} data={data.hex()}")
+                        if len(skipped) >= _MAX_FRAME_SKIP:
+                            raise ZoneTouch3ProtocolError(
+                                "No matching response to "
+                                f"{b''.join(r for r, _ in requests).hex()}; "
+                                f"received: {'; '.join(skipped)}"
+                            )
+            self.metrics.round_trip.add(time.monotonic() - start)
+            return cast(list[bytes], responses)
+        except (TimeoutError, OSError) as err:
+            raise ZoneTouch3ConnectionError(
+                f"Communication with {self._host}:{self._port} failed: {err}"
+            ) from err
+        finally:
+            stream.on_resync = None
+
+    async def _exchange_persistent(self, *requests: Request) -> list[bytes]:
+        """Send requests on the persistent connection and await the responses.
+
+        Frames are read by the background task, which resolves each pending
+        request when a matching frame arrives.
+        """
+        writer = self._writer
+        if writer is None:
+            raise ZoneTouch3ConnectionError(
+                f"Not connected to {self._host}:{self._port}"
             )
-        except (asyncio.IncompleteReadError, TimeoutError, OSError) as err:
+        loop = asyncio.get_running_loop()
+        self._pending = [
+            _PendingRequest(request, matches, loop.create_future())
+            for request, matches in requests
+        ]
+        start = time.monotonic()
+        try:
+            self._write(writer, requests)
+            await asyncio.wait_for(writer.drain(), self._timeout)
+            async with asyncio.timeout(self._timeout):
+                responses = [await pending.future for pending in self._pending]
+            self.metrics.round_trip.add(time.monotonic() - start)
+            self.breaker.record_success()
+            return responses
+        except (TimeoutError, OSError) as err:
+            # The stream is in an unknown state; let the background task
+            # reconnect rather than risk matching a late response.
+            writer.close()
+            self.breaker.record_failure()
             raise ZoneTouch3ConnectionError(
                 f"Communication with {self._host}:{self._port} failed: {err}"
             ) from err
+        finally:
+            self._pending = []
+
+    def _write(
+        self, writer: asyncio.StreamWriter, requests: tuple[Request, ...]
+    ) -> None:
+        data = b"".join(request for request, _ in requests)
+        self.metrics.bytes_out += len(data)
+        if self._capture is not None:
+            self._capture(Direction.SENT, data)
+        writer.write(data)
+
+    def _requery(
+        self, writer: asyncio.StreamWriter, requests: list[Request]
+    ) -> None:
+        """Ask again for responses that may have been lost to corruption.
+
+        Queries are sent again as they are. Commands are not repeated;
+        a status request fetches the group status they are answered with.
+        """
+        queries: dict[bytes, Request] = {}
+        for request, matches in requests:
+            if matches is _is_group_status:
+                request = _STATUS_REQUEST
+            queries[request] = (request, matches)
+        if queries and not writer.is_closing():
+            _LOGGER.debug("Requesting %s again after corrupt data", len(queries))
+            self.metrics.requeries += len(queries)
+            self._write(writer, tuple(queries.values()))
+
+    async def _run(self) -> None:
+        """Keep the persistent connection open and read everything it sends.
+
+        Reconnects back off as the breaker dictates. After failures, a new
+        connection is only used once the console has answered a probe.
+        """
+        while True:
+            while (delay := self.breaker.retry_in) > 0:
+                await asyncio.sleep(delay)
+            with suppress(ZoneTouch3CircuitOpenError):  # already half open
+                self.breaker.check()  # half open while probing
+            try:
+                reader, writer = await self._open()
+            except ZoneTouch3ConnectionError as err:
+                self.breaker.record_failure()
+                delay = self.breaker.retry_delay()
+                _LOGGER.debug("%s; retrying in %.0f s", err, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            if (sock := writer.get_extra_info("socket")) is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            stream = _FrameStream(reader, self.metrics.decoder, self._capture)
+            stream.on_resync = lambda: self._requery(
+                writer,
+                [
+                    (pending.request, pending.matches)
+                    for pending in self._pending
+                    if not pending.future.done()
+                ],
+            )
+            if self.breaker.failures:
+                try:
+                    await self._probe(stream, writer)
+                except (OSError, TimeoutError, ZoneTouch3Error) as err:
+                    self.breaker.record_failure()
+                    await self._close(writer)
+                    delay = self.breaker.retry_delay()
+                    _LOGGER.debug(
+                        "No answer from %s:%s (%s); retrying in %.0f s",
+                        self._host,
+                        self._port,
+                        err or "timeout",
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                self.breaker.record_success()
+            self._writer = writer
+            self._set_connected(True)
+            try:
+                while True:
+                    _, msg_type, data = await stream.read_frame()
+                    _LOGGER.debug(
+                        "Received frame type 0x%02X data=%s", msg_type, data.hex()
+                    )
+                    self._dispatch(msg_type, data)
+            except (OSError, ZoneTouch3Error) as err:
+                _LOGGER.debug(
+                    "Connection to %s:%s lost: %s", self._host, self._port, err
+                )
+            except Exception:
+                # Drop the connection and reconnect rather than stop for good.
+                _LOGGER.exception(
+                    "Unexpected error on the connection to %s:%s",
+                    self._host,
+                    self._port,
+                )
+            finally:
+                self._writer = None
+                self._set_connected(False)
+                for pending in self._pending:
+                    if not pending.future.done():
+                        pending.future.set_exception(
+                            ZoneTouch3ConnectionError(
+                                f"Connection to {self._host}:{self._port} lost"
+                            )
+                        )
+                await self._close(writer)
+            await asyncio.sleep(self.breaker.retry_delay())
+
+    async def _probe(
+        self, stream: _FrameStream, writer: asyncio.StreamWriter
+    ) -> None:
+        """Check that the console answers a status request on a connection."""
+        async with asyncio.timeout(self._timeout):
+            self._write(writer, ((_STATUS_REQUEST, _is_group_status),))
+            await writer.drain()
+            while True:
+                _, msg_type, data = await stream.read_frame()
+                self._dispatch(msg_type, data)  # status goes to the listeners
+                if _is_group_status(msg_type, data):
+                    return
+
+    def _dispatch(self, msg_type: int, data: bytes) -> None:
+        """Route a frame to a pending request or to the status listeners."""
+        waiting = [pending for pending in self._pending if not pending.future.done()]
+        partial = self._is_partial_status(msg_type, data)
+        for pending in waiting:
+            if pending.matches(msg_type, data) and not (
+                partial and pending.request == _STATUS_REQUEST
+            ):
+                pending.future.set_result(data)
+                return
+        if waiting:
+            self.metrics.frames_skipped += 1
+        for pending in waiting:
+            pending.skipped.append(f"type=0x{msg_type:02X} data={data.hex()}")
+            if len(pending.skipped) >= _MAX_FRAME_SKIP:
+                pending.future.set_exception(
+                    ZoneTouch3ProtocolError(
+                        f"No matching response to {pending.request.hex()}; "
+                        f"received: {'; '.join(pending.skipped)}"
+                    )
+                )
+
+        if not _is_group_status(msg_type, data):
+            return
+        try:
+            zones = _parse_group_status(data)
+        except ZoneTouch3ProtocolError as err:
+            _LOGGER.debug("Ignoring pushed group status: %s", err)
+            return
+        self._note_status(zones, complete=False)
+        for listener in list(self._status_listeners):
+            try:
+                listener(zones)
+            except Exception:
+                _LOGGER.exception("Error in ZoneTouch 3 status listener")
+
+    def _is_partial_status(self, msg_type: int, data: bytes) -> bool:
+        """Whether a frame is a group status of fewer zones than the console has.
+
+        The console pushes the status of just the zones that changed, so such
+        a frame is not the reply to a status request.
+        """
+        if self._status is None or not _is_group_status(msg_type, data):
+            return False
+        try:
+            return len(_parse_group_status(data)) < len(self._status[1])
+        except ZoneTouch3ProtocolError:
+            return False
+
+    def _set_connected(self, connected: bool) -> None:
+        if connected == self._connected.is_set():
+            return
+        if connected:
+            self._connected.set()
+        else:
+            self._connected.clear()
+        for listener in list(self._connection_listeners):
+            try:
+                listener(connected)
+            except Exception:
+                _LOGGER.exception("Error in ZoneTouch 3 connection listener")
+
+
+def _queue_cancelled() -> ZoneTouch3Error:
+    return ZoneTouch3Error("The command queue was cancelled")
+
+
+def _fail(waiters: list[asyncio.Future[dict[int, ZoneStatus]]], err: Exception) -> None:
+    for waiter in waiters:
+        if not waiter.done():
+            waiter.set_exception(err)
+
+
+class ZoneCommandQueue:
+    """Coalesces zone commands in front of ZoneTouch3Client.async_set_zones.
+
+    A command for a zone that is still waiting to be sent replaces the earlier
+    one, so only the latest setting reaches the console. Commands for
+    different zones that are waiting at the same time go out together in one
+    message, and messages are sent at most once every min_interval seconds.
+    Every caller gets the group status of the message that carried its
+    command, or the command that replaced it. cancel() stops the queue for
+    good.
+    """
+
+    def __init__(
+        self,
+        client: ZoneTouch3Client,
+        min_interval: float = DEFAULT_COMMAND_INTERVAL,
+    ) -> None:
+        self._client = client
+        self._min_interval = min_interval
+        self._pending: dict[int, ZoneCommand] = {}
+        self._waiters: list[asyncio.Future[dict[int, ZoneStatus]]] = []
+        self._task: asyncio.Task[None] | None = None
+        self._last_sent: float | None = None
+        self._cancelled = False
+
+    async def async_set_zone(
+        self,
+        zone: int,
+        power: PowerCommand = PowerCommand.KEEP,
+        percentage: int | None = None,
+    ) -> dict[int, ZoneStatus]:
+        """Queue a command for one zone and return the resulting group status."""
+        return await self.async_set_zones({zone: (power, percentage)})
+
+    async def async_set_zones(
+        self, commands: Mapping[int, ZoneCommand]
+    ) -> dict[int, ZoneStatus]:
+        """Queue commands for several zones and return the resulting status."""
+        _check_commands(commands)
+        if self._cancelled:
+            raise _queue_cancelled()
+        for zone, (power, percentage) in commands.items():
+            if (previous := self._pending.get(zone)) is not None:
+                # Whatever the new command keeps comes from the one it replaces.
+                if power is PowerCommand.KEEP:
+                    power = previous[0]
+                if percentage is None:
+                    percentage = previous[1]
+            self._pending[zone] = (power, percentage)
+
+        future: asyncio.Future[dict[int, ZoneStatus]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._waiters.append(future)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return await future
+
+    def cancel(self) -> None:
+        """Drop the queued commands and send nothing more.
+
+        Callers still waiting get a ZoneTouch3Error, as do later commands.
+        """
+        self._cancelled = True
+        self._pending = {}
+        if self._task is not None:
+            self._task.cancel()
+        waiters, self._waiters = self._waiters, []
+        _fail(waiters, _queue_cancelled())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if self._last_sent is not None:
+                delay = self._last_sent + self._min_interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            commands, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, []
+            self._last_sent = loop.time()
+            try:
+                zones = await self._client.async_set_zones(commands)
+            except asyncio.CancelledError:
+                _fail(waiters, _queue_cancelled())
+                raise
+            except Exception as err:  # handed to the callers
+                _fail(waiters, err)
+            else:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(zones)
+